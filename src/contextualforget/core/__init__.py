@@ -12,7 +12,7 @@ from .advanced_forgetting import (
     create_default_forgetting_policy,
 )
 from .eval_metrics import ndcg_at_k
-from .forgetting import expired, score
+from .forgetting import age_days, age_days_batch, expired, expired_batch, score, score_batch
 from .logging import (
     DataPipelineLogger,
     PerformanceMonitor,
@@ -30,12 +30,23 @@ from .monitoring import (
     start_monitoring,
     stop_monitoring,
 )
-from .utils import extract_ifc_entities, parse_bcf_zip, read_jsonl, write_jsonl
+from .utils import (
+    extract_ifc_entities,
+    parse_bcf_zip,
+    read_graph,
+    read_jsonl,
+    write_graph_json,
+    write_jsonl,
+)
 
 __all__ = [
     # Forgetting
     "expired",
+    "expired_batch",
+    "age_days",
+    "age_days_batch",
     "score",
+    "score_batch",
     "ForgettingPolicy",
     "TTLPolicy", 
     "WeightedDecayPolicy",
@@ -50,6 +61,8 @@ __all__ = [
     "write_jsonl", 
     "extract_ifc_entities",
     "parse_bcf_zip",
+    "read_graph",
+    "write_graph_json",
     # Evaluation
     "ndcg_at_k",
     # Logging
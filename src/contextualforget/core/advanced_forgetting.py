@@ -4,7 +4,17 @@ Advanced forgetting policies for long-term memory management.
 from __future__ import annotations
 
 import math
-from datetime import datetime, timezone
+from itertools import compress
+
+import numpy as np
+
+from .forgetting import age_days, age_days_batch
+
+
+def _event_column(events: list[dict], key: str, default: float) -> np.ndarray:
+    """Collect one numeric field of every event into a float array."""
+    return np.fromiter((event.get(key, default) for event in events),
+                       dtype=np.float64, count=len(events))
 
 
 class ForgettingPolicy:
@@ -13,6 +23,12 @@ class ForgettingPolicy:
     def should_forget(self, event_data: dict, context: dict) -> bool:
         """Determine if an event should be forgotten."""
         raise NotImplementedError
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        """Boolean mask of events to forget (override for a vectorized check)."""
+        return np.fromiter((self.should_forget(event, context)
+                            for event, context in zip(events, contexts)),
+                           dtype=bool, count=len(events))
 
 
 class TTLPolicy(ForgettingPolicy):
@@ -22,16 +38,15 @@ class TTLPolicy(ForgettingPolicy):
         self.ttl_days = ttl_days
     
     def should_forget(self, event_data: dict, context: dict) -> bool:
-        created_iso = event_data.get("created", "")
-        if not created_iso:
-            return True
-        
-        try:
-            created_time = datetime.fromisoformat(created_iso.replace("Z", "+00:00"))
-            age_days = (datetime.now(timezone.utc) - created_time).days
-            return age_days > self.ttl_days
-        except Exception:
-            return True
+        age = age_days(event_data.get("created", ""))
+        if age is None:
+            return True  # missing or invalid date
+        return age > self.ttl_days
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        ages = age_days_batch([event.get("created", "") for event in events])
+        # NaN (missing or invalid date) compares False, so it is forgotten
+        return ~(ages <= self.ttl_days)
 
 
 class WeightedDecayPolicy(ForgettingPolicy):
@@ -53,12 +68,8 @@ class WeightedDecayPolicy(ForgettingPolicy):
         if not created_iso:
             return True
         
-        try:
-            created_time = datetime.fromisoformat(created_iso.replace("Z", "+00:00"))
-            age_days = (datetime.now(timezone.utc) - created_time).days
-            recency_score = math.exp(-self.decay_rate * age_days / 365.0)
-        except Exception:
-            recency_score = 0.0
+        age = age_days(created_iso)
+        recency_score = 0.0 if age is None else math.exp(-self.decay_rate * age / 365.0)
         
         # Get usage count from context
         usage_count = context.get("usage_count", 0)
@@ -77,6 +88,23 @@ class WeightedDecayPolicy(ForgettingPolicy):
         
         # Forget if score is below threshold
         return total_score < 0.01
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        created = [event.get("created", "") for event in events]
+        missing = np.fromiter((not c for c in created), dtype=bool, count=len(events))
+        
+        ages = age_days_batch(created)
+        recency_score = np.where(np.isnan(ages), 0.0,
+                                 np.exp(-self.decay_rate * np.nan_to_num(ages) / 365.0))
+        usage_score = np.minimum(_event_column(contexts, "usage_count", 0) / 10.0, 1.0)
+        importance_score = _event_column(events, "importance", 0.5)
+        
+        total_score = (
+            self.recency_weight * recency_score +
+            self.usage_weight * usage_score +
+            self.importance_weight * importance_score
+        )
+        return missing | (total_score < 0.01)
 
 
 class ImportanceBasedPolicy(ForgettingPolicy):
@@ -88,6 +116,9 @@ class ImportanceBasedPolicy(ForgettingPolicy):
     def should_forget(self, event_data: dict, context: dict) -> bool:
         importance = event_data.get("importance", 0.5)
         return importance < self.importance_threshold
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        return _event_column(events, "importance", 0.5) < self.importance_threshold
 
 
 class ContradictionPolicy(ForgettingPolicy):
@@ -99,6 +130,9 @@ class ContradictionPolicy(ForgettingPolicy):
     def should_forget(self, event_data: dict, context: dict) -> bool:
         contradiction_count = event_data.get("contradiction_count", 0)
         return contradiction_count >= self.contradiction_threshold
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        return _event_column(events, "contradiction_count", 0) >= self.contradiction_threshold
 
 
 class CompositeForgettingPolicy(ForgettingPolicy):
@@ -116,6 +150,16 @@ class CompositeForgettingPolicy(ForgettingPolicy):
             return any(results)
         else:  # "all"
             return all(results)
+    
+    def should_forget_batch(self, events: list[dict], contexts: list[dict]) -> np.ndarray:
+        if not self.policies:
+            return np.full(len(events), self.mode != "any")
+        masks = [policy.should_forget_batch(events, contexts) for policy in self.policies]
+        
+        if self.mode == "any":
+            return np.logical_or.reduce(masks)
+        else:  # "all"
+            return np.logical_and.reduce(masks)
 
 
 class ForgettingManager:
@@ -138,8 +182,17 @@ class ForgettingManager:
         return self.policy.should_forget(event_data, context)
     
     def filter_events(self, events: list[dict]) -> list[dict]:
-        """Filter events based on forgetting policy."""
-        return [event for event in events if not self.should_forget_event(event)]
+        """Filter events based on forgetting policy.
+        
+        Uses one ``should_forget_batch`` check over all events, unless a subclass
+        overrides ``should_forget_event``; then each event goes through that override.
+        """
+        if type(self).should_forget_event is not ForgettingManager.should_forget_event:
+            return [event for event in events if not self.should_forget_event(event)]
+        contexts = [{"usage_count": self.usage_stats.get(event.get("topic_id", ""), 0)}
+                    for event in events]
+        forget = self.policy.should_forget_batch(events, contexts)
+        return list(compress(events, ~forget))
     
     def get_forgetting_stats(self) -> dict:
         """Get statistics about forgetting decisions."""
@@ -164,26 +217,28 @@ def create_default_forgetting_policy() -> ForgettingManager:
     return ForgettingManager(composite_policy)
 
 
+# Importance lookup tables for calculate_event_importance (built once at import)
+_EVENT_TYPE_IMPORTANCE = {
+    "critical": 1.0,
+    "high": 0.8,
+    "medium": 0.6,
+    "low": 0.4,
+    "unknown": 0.5
+}
+_LABEL_IMPORTANCE_BOOST = {
+    "safety": 0.2,
+    "structural": 0.15,
+    "critical": 0.1
+}
+
+
 def calculate_event_importance(event_data: dict) -> float:
     """Calculate importance score for an event."""
     # Base importance from event type
-    event_type = event_data.get("type", "unknown")
-    type_importance = {
-        "critical": 1.0,
-        "high": 0.8,
-        "medium": 0.6,
-        "low": 0.4,
-        "unknown": 0.5
-    }.get(event_type, 0.5)
+    type_importance = _EVENT_TYPE_IMPORTANCE.get(event_data.get("type", "unknown"), 0.5)
     
     # Adjust based on labels
     labels = event_data.get("labels", [])
-    label_boost = 0.0
-    if "safety" in labels:
-        label_boost += 0.2
-    if "structural" in labels:
-        label_boost += 0.15
-    if "critical" in labels:
-        label_boost += 0.1
+    label_boost = sum(boost for label, boost in _LABEL_IMPORTANCE_BOOST.items() if label in labels)
     
     return min(type_importance + label_boost, 1.0)
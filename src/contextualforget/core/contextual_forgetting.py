@@ -6,6 +6,7 @@ RQ2: 맥락적 망각 메커니즘 구현
 from __future__ import annotations
 
 import json
+import math
 import pickle
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -42,6 +43,14 @@ class ContextualForgettingManager:
         self.recency_weight = recency_weight
         self.relevance_weight = relevance_weight
         
+        # reset() 시 복원할 초기 임계값/가중치 (실행 중 정책/엔진이 변경함)
+        self._initial_params = {
+            'forgetting_threshold': forgetting_threshold,
+            'usage_weight': usage_weight,
+            'recency_weight': recency_weight,
+            'relevance_weight': relevance_weight
+        }
+        
         # 맥락 히스토리
         self.context_history: deque = deque(maxlen=context_window_size)
         
@@ -55,6 +64,14 @@ class ContextualForgettingManager:
         
         # 맥락별 관련성 매트릭스
         self.context_relevance_matrix: Dict[str, Dict[str, float]] = defaultdict(dict)
+    
+    def reset(self) -> None:
+        """맥락/문서 통계를 비우고 임계값과 가중치를 초기값으로 복원"""
+        for name, value in self._initial_params.items():
+            setattr(self, name, value)
+        self.context_history.clear()
+        self.document_stats.clear()
+        self.context_relevance_matrix.clear()
         
     def update_context(self, query: str, retrieved_docs: List[Dict[str, Any]]) -> None:
         """맥락 정보 업데이트"""
@@ -231,30 +248,136 @@ class ContextualForgettingManager:
             'context_history_size': len(self.context_history)
         }
     
-    def save_state(self, filepath: str) -> None:
-        """상태 저장"""
+    def save_state(self, filepath: str, legacy: bool = False) -> None:
+        """상태 저장
+        
+        숫자 상태(문서 통계, 맥락 벡터)는 연속 배열로, 나머지(설정, 쿼리 기록)는
+        JSON 헤더로 하나의 압축 ``.npz`` 파일에 저장합니다 (pickle 미사용).
+        
+        Args:
+            filepath: 저장 경로 (확장자는 그대로 사용)
+            legacy: True면 기존 pickle 형식으로 저장
+        """
+        if legacy:
+            self._save_state_pickle(filepath)
+            return
+        
+        doc_ids = list(self.document_stats.keys())
+        stats = [self.document_stats[doc_id] for doc_id in doc_ids]
+        
+        vectors = [np.asarray(ctx['context_vector'], dtype=np.float64) for ctx in self.context_history]
+        offsets = np.zeros(len(vectors) + 1, dtype=np.int64)
+        if vectors:
+            offsets[1:] = np.cumsum([len(v) for v in vectors])
+        
+        meta = {
+            'version': 1,
+            'config': self._config_dict(),
+            'context_history': [
+                {
+                    'timestamp': ctx['timestamp'].isoformat(),
+                    'query': ctx['query'],
+                    'retrieved_docs': ctx['retrieved_docs']
+                }
+                for ctx in self.context_history
+            ],
+            'context_relevance_matrix': dict(self.context_relevance_matrix)
+        }
+        
+        arrays = {
+            'meta': np.array(json.dumps(meta, ensure_ascii=False)),
+            'doc_ids': np.array(doc_ids, dtype=str),
+            'access_count': np.array([st['access_count'] for st in stats], dtype=np.int64),
+            'last_access': np.array(
+                [st['last_access'].timestamp() if st['last_access'] else np.nan for st in stats],
+                dtype=np.float64
+            ),
+            'context_relevance': np.array([st['context_relevance'] for st in stats], dtype=np.float64),
+            'forgetting_score': np.array([st['forgetting_score'] for st in stats], dtype=np.float64),
+            'context_vectors': np.concatenate(vectors) if vectors else np.zeros(0, dtype=np.float64),
+            'context_vector_offsets': offsets
+        }
+        
+        # 파일 객체로 전달해야 numpy가 '.npz' 확장자를 덧붙이지 않음
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+    
+    def load_state(self, filepath: str, legacy: bool = False) -> None:
+        """상태 로드
+        
+        Args:
+            filepath: 저장 경로
+            legacy: True면 기존 pickle 형식 파일로 간주
+        """
+        if not Path(filepath).exists():
+            return
+        
+        if legacy:
+            self._load_state_pickle(filepath)
+            return
+        
+        with np.load(filepath, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            doc_ids = data['doc_ids'].tolist()
+            access_count = data['access_count'].tolist()
+            last_access = data['last_access'].tolist()
+            context_relevance = data['context_relevance'].tolist()
+            forgetting_score = data['forgetting_score'].tolist()
+            vectors = data['context_vectors']
+            offsets = data['context_vector_offsets']
+            
+            context_history = []
+            for i, ctx in enumerate(meta['context_history']):
+                context_history.append({
+                    'timestamp': datetime.fromisoformat(ctx['timestamp']),
+                    'query': ctx['query'],
+                    'retrieved_docs': ctx['retrieved_docs'],
+                    'context_vector': vectors[offsets[i]:offsets[i + 1]].copy()
+                })
+        
+        document_stats = {}
+        for i, doc_id in enumerate(doc_ids):
+            ts = last_access[i]
+            document_stats[doc_id] = {
+                'access_count': access_count[i],
+                'last_access': None if math.isnan(ts) else datetime.fromtimestamp(ts, tz=timezone.utc),
+                'context_relevance': context_relevance[i],
+                'forgetting_score': forgetting_score[i]
+            }
+        
+        self.context_history = deque(context_history, maxlen=self.context_window_size)
+        self.document_stats = defaultdict(lambda: {
+            'access_count': 0,
+            'last_access': None,
+            'context_relevance': 0.0,
+            'forgetting_score': 1.0
+        }, document_stats)
+        self.context_relevance_matrix = defaultdict(dict, meta['context_relevance_matrix'])
+    
+    def _config_dict(self) -> Dict[str, Any]:
+        return {
+            'context_window_size': self.context_window_size,
+            'forgetting_threshold': self.forgetting_threshold,
+            'context_decay_rate': self.context_decay_rate,
+            'usage_weight': self.usage_weight,
+            'recency_weight': self.recency_weight,
+            'relevance_weight': self.relevance_weight
+        }
+    
+    def _save_state_pickle(self, filepath: str) -> None:
+        """기존 pickle 형식 저장 (하위 호환용)"""
         state = {
             'context_history': list(self.context_history),
             'document_stats': dict(self.document_stats),
             'context_relevance_matrix': dict(self.context_relevance_matrix),
-            'config': {
-                'context_window_size': self.context_window_size,
-                'forgetting_threshold': self.forgetting_threshold,
-                'context_decay_rate': self.context_decay_rate,
-                'usage_weight': self.usage_weight,
-                'recency_weight': self.recency_weight,
-                'relevance_weight': self.relevance_weight
-            }
+            'config': self._config_dict()
         }
         
         with open(filepath, 'wb') as f:
             pickle.dump(state, f)
     
-    def load_state(self, filepath: str) -> None:
-        """상태 로드"""
-        if not Path(filepath).exists():
-            return
-            
+    def _load_state_pickle(self, filepath: str) -> None:
+        """기존 pickle 형식 로드 (하위 호환용)"""
         with open(filepath, 'rb') as f:
             state = pickle.load(f)
         
@@ -274,6 +397,10 @@ class AdaptiveForgettingPolicy:
     def __init__(self, forgetting_manager: ContextualForgettingManager):
         self.forgetting_manager = forgetting_manager
         self.performance_history = deque(maxlen=100)
+    
+    def reset(self) -> None:
+        """성능 기록 초기화"""
+        self.performance_history.clear()
         
     def adapt_threshold(self, performance_metric: float) -> None:
         """성능에 따라 망각 임계값 적응"""
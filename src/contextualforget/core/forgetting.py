@@ -1,16 +1,72 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
 
+import numpy as np
+
+_SECONDS_PER_DAY = 86400.0
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp(created_iso: str) -> float | None:
+    try:
+        t = datetime.fromisoformat(created_iso.replace("Z", "+00:00"))
+        return t.timestamp() if t.tzinfo is not None else None
+    except (ValueError, OverflowError):
+        return None
+
+def created_timestamp(created_iso) -> float | None:
+    """Unix seconds of an ISO timestamp, None if missing, invalid or without offset.
+
+    Parsed strings are memoized, so events re-checked by forgetting
+    policies skip ``fromisoformat`` after the first time.
+    """
+    if not created_iso or not isinstance(created_iso, str):
+        return None
+    return _parse_timestamp(created_iso)
+
+def age_days(created_iso, now_ts: float | None = None) -> float | None:
+    """Whole-day age of an ISO timestamp (like ``timedelta.days``), None if invalid."""
+    ts = created_timestamp(created_iso)
+    if ts is None:
+        return None
+    return ((time.time() if now_ts is None else now_ts) - ts) // _SECONDS_PER_DAY
 
 def expired(created_iso: str, ttl: int) -> bool:
     if ttl <= 0:
         return False
-    try:
-        t = datetime.fromisoformat(created_iso.replace("Z", "+00:00"))
-    except Exception:
+    age = age_days(created_iso)
+    if age is None:
         return True  # Invalid dates should be considered expired
-    return (datetime.now(timezone.utc) - t).days > ttl
+    return age > ttl
+
+def age_days_batch(created_isos: Sequence, now_ts: float | None = None) -> np.ndarray:
+    """Whole-day ages of ISO timestamps, NaN where a timestamp is invalid.
+
+    Uses the same memoized parser as ``age_days``, so element ``i`` always
+    equals ``age_days(created_isos[i])``; non-string values and timestamps
+    without a UTC offset count as invalid.
+    """
+    timestamps = np.fromiter(
+        (np.nan if ts is None else ts for ts in map(created_timestamp, created_isos)),
+        dtype=np.float64, count=len(created_isos))
+    return np.floor_divide((time.time() if now_ts is None else now_ts) - timestamps, _SECONDS_PER_DAY)
+
+def expired_batch(created_isos: Sequence, ttl: int) -> np.ndarray:
+    """Vectorized ``expired``: boolean mask of timestamps older than ``ttl`` days."""
+    if ttl <= 0:
+        return np.zeros(len(created_isos), dtype=bool)
+    # NaN (invalid date) compares False, so it is treated as expired
+    return ~(age_days_batch(created_isos) <= ttl)
 
 def score(recency_days: float, usage: int, confidence: float, contradiction: int) -> float:
     return 0.6*max(0, 1.0 - recency_days/365.0) + 0.2*(usage/10.0) + 0.2*confidence - 0.1*contradiction
+
+def score_batch(recency_days, usage, confidence, contradiction) -> np.ndarray:
+    """Vectorized ``score`` over equal-length arrays (or scalars, broadcast)."""
+    recency_days = np.asarray(recency_days, dtype=np.float64)
+    return (0.6*np.maximum(0, 1.0 - recency_days/365.0) + 0.2*(np.asarray(usage, dtype=np.float64)/10.0)
+            + 0.2*np.asarray(confidence, dtype=np.float64) - 0.1*np.asarray(contradiction, dtype=np.float64))
@@ -1,77 +1,224 @@
 from __future__ import annotations
 
+import inspect
 import json
+import math
+import mmap
 import os
+import pickle
 import re
 import xml.etree.ElementTree as ET
 import zipfile
+from itertools import islice
 from pathlib import Path
 
+import networkx as nx
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+try:
+    from lxml import etree as _xml_etree
+    _XML_PARSE_ERRORS: tuple = (_xml_etree.XMLSyntaxError, ET.ParseError)
+except ImportError:  # lxml is optional; fall back to the stdlib parser
+    _xml_etree = ET
+    _XML_PARSE_ERRORS = (ET.ParseError,)
+
+_IFC_ENTITY_RE = re.compile(r"IFC([A-Z0-9_]+)\('([A-Za-z0-9_]{10,24})'")
+_IFC_ENTITY_BYTES_RE = re.compile(rb"IFC([A-Z0-9_]+)\('([A-Za-z0-9_]{10,24})'")
+_JSONL_WRITE_CHUNK = 4096  # write_jsonl이 한 번의 write로 내보내는 행 수
+_JSONL_MMAP_MAX_SIZE = 2 << 30  # 이보다 큰 파일은 mmap 대신 버퍼 반복자로 읽음
+_MKDIR_CACHE: set[str] = set()  # write_jsonl이 이미 생성을 확인한 디렉토리 (절대 경로)
+
 
 def read_jsonl(p: str):
-    with Path(p).open(encoding="utf-8") as f:
+    if orjson is None:
+        with Path(p).open(encoding="utf-8") as f:
+            for line in f:
+                s = line.strip()
+                if s:
+                    yield json.loads(s)
+        return
+
+    with Path(p).open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size <= _JSONL_MMAP_MAX_SIZE:
+            # 로컬 파일은 메모리 매핑 후 줄 단위로 잘라 orjson에 바로 전달 (OS readahead 활용)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    if line.strip():
+                        yield _loads_jsonl_row(line)
+            return
         for line in f:
-            s = line.strip()
-            if s:
-                yield json.loads(s)
+            if line.strip():
+                yield _loads_jsonl_row(line)
+
+def _loads_jsonl_row(line: bytes):
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        # write_jsonl이 json으로 기록한 NaN/Infinity는 orjson이 거부하므로 json으로 다시 파싱
+        return json.loads(line)
+
+def _json_default(obj):
+    # numpy 스칼라(np.int64 등)는 파이썬 기본 타입으로 변환
+    if hasattr(obj, "item") and getattr(obj, "ndim", None) == 0:
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _has_non_finite(obj) -> bool:
+    # 행 안에 NaN/Infinity 실수(numpy 스칼라 포함)가 있는지 재귀적으로 확인
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if getattr(obj, "ndim", None) == 0 and getattr(obj, "dtype", None) is not None:
+        return obj.dtype.kind == "f" and not math.isfinite(obj.item())
+    return False
+
+def _dumps_jsonl_row(r, option: int) -> bytes:
+    line = orjson.dumps(r, default=_json_default, option=option)
+    # orjson은 NaN/Infinity를 null로 쓰므로, 실제 비유한 실수가 있는 행만 json으로 다시 직렬화해
+    # 기존 출력(NaN)을 유지 (null이 없는 행은 비유한 값이 있을 수 없어 검사 생략)
+    if b"null" in line and _has_non_finite(r):
+        text = json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+        return (text + "\n").encode("utf-8")
+    return line
+
+def _open_jsonl_for_write(path: Path, d: str, *args, **kwargs):
+    try:
+        return path.open(*args, **kwargs)
+    except FileNotFoundError:
+        # _MKDIR_CACHE에 있던 디렉토리가 이후 삭제된 경우 다시 만들고 재시도
+        os.makedirs(d, exist_ok=True)
+        return path.open(*args, **kwargs)
 
 def write_jsonl(p: str, rows):
     path = Path(p)
-    if path.parent:  # parent가 비어있지 않을 때만 mkdir 호출
-        path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    # 같은 디렉토리에 반복해서 쓸 때 mkdir 시스템 호출을 한 번만 수행
+    d = os.path.dirname(os.path.abspath(path))
+    if d not in _MKDIR_CACHE:
+        os.makedirs(d, exist_ok=True)
+        _MKDIR_CACHE.add(d)
+    if orjson is None:
+        with _open_jsonl_for_write(path, d, "w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False, default=_json_default) + "\n")
+        return
+
+    # orjson은 UTF-8 바이트를 바로 생성 (ensure_ascii=False와 동일), 정수 키는 문자열로 변환
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    encoded = (_dumps_jsonl_row(r, option) for r in rows)
+    # 행 단위 write 대신 청크 단위로 묶어서 기록
+    with _open_jsonl_for_write(path, d, "wb", buffering=1 << 20) as f:
+        while chunk := list(islice(encoded, _JSONL_WRITE_CHUNK)):
+            f.write(b"".join(chunk))
+
+def _node_link_kwargs() -> dict:
+    # networkx>=3.4 takes an explicit edge key; older versions always use "links"
+    if "edges" in inspect.signature(nx.node_link_data).parameters:
+        return {"edges": "links"}
+    return {}
+
+def write_graph_json(G: nx.DiGraph, p: str):
+    """Write a graph as node-link JSON (tuple node ids become 2-element arrays)."""
+    data = nx.node_link_data(G, **_node_link_kwargs())
+    path = Path(p)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is None:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+
+def read_graph(p: str) -> nx.DiGraph:
+    """Load a graph from node-link JSON (``.json``) or a pickled graph file."""
+    path = Path(p)
+    if path.suffix != ".json":
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    raw = path.read_bytes()
+    if orjson is None:
+        data = json.loads(raw)
+    else:
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # 속성에 NaN/Infinity가 있으면 orjson이 거부하므로 json으로 다시 파싱
+            data = json.loads(raw)
+    # JSON has no tuples: restore ("IFC", guid) / ("BCF", topic_id) node ids
+    for node in data["nodes"]:
+        if isinstance(node["id"], list):
+            node["id"] = tuple(node["id"])
+    for link in data["links"]:
+        if isinstance(link["source"], list):
+            link["source"] = tuple(link["source"])
+        if isinstance(link["target"], list):
+            link["target"] = tuple(link["target"])
+    return nx.node_link_graph(data, **_node_link_kwargs())
 
-def extract_ifc_entities(text: str):
+def extract_ifc_entities(text: str | bytes):
     """
     Minimal fallback: capture IFC<UPPER>( '<GUID>',
     Returns list of dicts: {guid, type, name}
+    Accepts str or bytes; bytes are scanned without decoding.
     """
-    ents = []
-    for m in re.finditer(r"IFC([A-Z0-9_]+)\('([A-Za-z0-9_]{10,24})'", text):
-        etype = m.group(1)
-        guid = m.group(2)
-        ents.append({"guid": guid, "type": etype, "name": guid})
-    # Deduplicate by GUID
+    if isinstance(text, bytes):
+        matches = ((m.group(1).decode("ascii"), m.group(2).decode("ascii"))
+                   for m in _IFC_ENTITY_BYTES_RE.finditer(text))
+    else:
+        matches = (m.groups() for m in _IFC_ENTITY_RE.finditer(text))
+    # Deduplicate by GUID (last occurrence wins)
     uniq = {}
-    for e in ents:
-        uniq[e["guid"]] = e
+    for etype, guid in matches:
+        uniq[guid] = {"guid": guid, "type": etype, "name": guid}
     return list(uniq.values())
 
 def parse_bcf_zip(bcf_path: str):
     rows = []
     with zipfile.ZipFile(bcf_path) as z:
-        for n in z.namelist():
-            if n.endswith("markup.bcf"):
-                try:
-                    root = ET.fromstring(z.read(n))
-                    # Topic 태그 찾기
-                    topic = root.find("Topic")
-                    if topic is not None:
-                        topic_id = topic.attrib.get("Guid", "")
-                        title = topic.findtext("Title", "")
-                        created = topic.findtext("CreationDate", "")
-                        author = topic.findtext("CreationAuthor", "")
-                        description = topic.findtext("Description", "")
-                        
-                        # ReferenceLink는 Viewpoints에서 찾기
-                        ref = ""
-                        viewpoints = root.find("Viewpoints")
-                        if viewpoints is not None:
-                            related_topic = viewpoints.find("RelatedTopic")
-                            if related_topic is not None:
-                                ref = related_topic.attrib.get("Guid", "")
-                        
-                        rows.append({
-                            "topic_id": topic_id,
-                            "title": title,
-                            "created": created,
-                            "author": author,
-                            "description": description,
-                            "ref": ref
-                        })
-                except ET.ParseError as e:
-                    print(f"XML 파싱 오류 in {n}: {e}")
-                    continue
+        # markup 항목만 먼저 추려서 순회 (첨부/뷰포인트 항목은 건너뜀)
+        markups = [n for n in z.namelist() if n.endswith("markup.bcf")]
+        for n in markups:
+            try:
+                # 압축 해제 스트림에서 바로 파싱 (lxml이 있으면 C 파서 사용)
+                with z.open(n) as fh:
+                    root = _xml_etree.parse(fh).getroot()
+                # Topic 태그 찾기
+                topic = root.find("Topic")
+                if topic is not None:
+                    topic_id = topic.attrib.get("Guid", "")
+                    # 자식 요소를 한 번만 순회해 필드 수집 (태그가 중복되면 첫 요소 사용)
+                    fields = {}
+                    for child in topic:
+                        fields.setdefault(child.tag, child.text or "")
+                    title = fields.get("Title", "")
+                    created = fields.get("CreationDate", "")
+                    author = fields.get("CreationAuthor", "")
+                    description = fields.get("Description", "")
+                    
+                    # ReferenceLink는 Viewpoints에서 찾기
+                    ref = ""
+                    viewpoints = root.find("Viewpoints")
+                    if viewpoints is not None:
+                        related_topic = viewpoints.find("RelatedTopic")
+                        if related_topic is not None:
+                            ref = related_topic.attrib.get("Guid", "")
+                    
+                    rows.append({
+                        "topic_id": topic_id,
+                        "title": title,
+                        "created": created,
+                        "author": author,
+                        "description": description,
+                        "ref": ref
+                    })
+            except _XML_PARSE_ERRORS as e:
+                print(f"XML 파싱 오류 in {n}: {e}")
+                continue
     return rows
@@ -148,7 +148,7 @@ def main():
     # 저장
     Path(a.out).parent.mkdir(parents=True, exist_ok=True)
     with Path(a.out).open('wb') as f:
-        pickle.dump(G, f)
+        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
     
     print(f"\n✅ 그래프 저장 완료: {a.out}")
     
@@ -14,10 +14,8 @@ def main():
     ap.add_argument("--out", required=True)
     a = ap.parse_args()
 
-    with Path(a.ifc).open(errors="ignore") as f:
-        text = f.read()
-
-    rows = extract_ifc_entities(text)
+    # Read raw bytes; extract_ifc_entities scans them without decoding
+    rows = extract_ifc_entities(Path(a.ifc).read_bytes())
     write_jsonl(a.out, rows)
 
 if __name__ == "__main__":
@@ -16,6 +16,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from contextualforget.core import read_jsonl, write_jsonl
 
+# IFC GUID 패턴: 22자 Base64 변형
+# \b는 한국어와 함께 사용 시 문제가 있으므로 더 유연한 패턴 사용
+_GUID_PATTERN = re.compile(r'[0-9A-Za-z_$]{22}(?![0-9A-Za-z_$])')
+
 
 def extract_guid_from_text(text: str) -> List[str]:
     """
@@ -24,10 +28,7 @@ def extract_guid_from_text(text: str) -> List[str]:
     IFC GUID는 22자 Base64 변형 문자열입니다.
     허용 문자: 0-9, A-Z, a-z, _, $
     """
-    # IFC GUID 패턴: 22자 Base64 변형
-    # \b는 한국어와 함께 사용 시 문제가 있으므로 더 유연한 패턴 사용
-    guid_pattern = r'[0-9A-Za-z_$]{22}(?![0-9A-Za-z_$])'
-    guids = re.findall(guid_pattern, text)
+    guids = _GUID_PATTERN.findall(text)
     return list(set(guids))  # 중복 제거
 
 def semantic_match_tfidf(bcf_text: str, ifc_items: Dict[str, Dict]) -> List[Tuple[str, float]]:
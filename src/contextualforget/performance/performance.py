@@ -10,10 +10,11 @@ import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import networkx as nx
 
+from ..core import expired
 
 class GraphOptimizer:
     """Optimizes graph operations for large datasets."""
@@ -28,10 +29,26 @@ class GraphOptimizer:
         self.bcf_index = {}
         self.author_index = {}
         self.date_index = {}
+        # IFC GUID -> hits from the BCF topics that point at it (shared with batch_query results)
+        self.topic_hits_index = {}
         
+        node_attrs = self.graph.nodes
         for node, data in self.graph.nodes(data=True):
             if node[0] == "IFC":
                 self.ifc_index[node[1]] = node
+                self.topic_hits_index[node[1]] = [
+                    {
+                        "topic_id": predecessor[1],
+                        "created": node_attrs[predecessor].get("created"),
+                        "title": node_attrs[predecessor].get("title", ""),
+                        "edge": {
+                            "type": edge_data.get("type", "refersTo"),
+                            "confidence": edge_data.get("confidence", 1.0)
+                        }
+                    }
+                    for predecessor, edge_data in self.graph.pred[node].items()
+                    if predecessor[0] == "BCF"
+                ]
             elif node[0] == "BCF":
                 self.bcf_index[node[1]] = node
                 
@@ -59,38 +76,24 @@ class GraphOptimizer:
         return list(self.graph.neighbors(node))
     
     def batch_query(self, guids: list[str], ttl: int = 0) -> dict[str, list[dict]]:
-        """Batch query multiple GUIDs efficiently."""
+        """Batch query multiple GUIDs efficiently.
+        
+        Hits come from the reverse index built at construction time, so no
+        graph traversal happens per query. The hit dicts are shared; treat
+        them as read-only.
+        """
         results = {}
         
         for guid in guids:
-            if guid in self.ifc_index:
-                node = self.ifc_index[guid]
-                _neighbors = self.get_neighbors_cached(node)
-                
-                hits = []
-                # Check predecessors (BCF nodes that point to this IFC node)
-                for predecessor in self.graph.predecessors(node):
-                    if predecessor[0] == "BCF":
-                        edge_data = self.graph.get_edge_data(predecessor, node, {})
-                        node_data = self.graph.nodes[predecessor]
-                        
-                        # Apply TTL filtering
-                        if ttl > 0:
-                            from ..core import expired
-                            if expired(node_data.get("created", ""), ttl):
-                                continue
-                        
-                        hits.append({
-                            "topic_id": predecessor[1],
-                            "created": node_data.get("created"),
-                            "title": node_data.get("title", ""),
-                            "edge": {
-                                "type": edge_data.get("type", "refersTo"),
-                                "confidence": edge_data.get("confidence", 1.0)
-                            }
-                        })
-                
-                results[guid] = hits
+            hits = self.topic_hits_index.get(guid)
+            if hits is None:
+                continue
+            
+            # Apply TTL filtering
+            if ttl > 0:
+                results[guid] = [hit for hit in hits if not expired(hit["created"] or "", ttl)]
+            else:
+                results[guid] = list(hits)
         
         return results
 
@@ -176,13 +179,21 @@ class MemoryOptimizer:
         
         return compressed
     
+    @staticmethod
+    def dumps_graph_compressed(graph: nx.DiGraph) -> bytes:
+        """Serialize graph in compressed format to bytes."""
+        compressed = MemoryOptimizer.compress_graph(graph)
+        return pickle.dumps(compressed, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @staticmethod
+    def loads_graph_compressed(data: bytes) -> nx.DiGraph:
+        """Deserialize a graph produced by dumps_graph_compressed."""
+        return pickle.loads(data)
+    
     @staticmethod
     def save_graph_compressed(graph: nx.DiGraph, filepath: str):
         """Save graph in compressed format."""
-        compressed = MemoryOptimizer.compress_graph(graph)
-        
-        with Path(filepath).open('wb') as f:
-            pickle.dump(compressed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        Path(filepath).write_bytes(MemoryOptimizer.dumps_graph_compressed(graph))
     
     @staticmethod
     def load_graph_compressed(filepath: str) -> nx.DiGraph:
@@ -191,8 +202,19 @@ class MemoryOptimizer:
             return pickle.load(f)
 
 
+class _CacheEntry(NamedTuple):
+    """Cached value with its wall-clock expiry (None never expires)."""
+    data: Any
+    expires_at: float | None
+
+
 class CacheManager:
-    """Cache management for frequently accessed data."""
+    """Cache management for frequently accessed data.
+    
+    Entries may carry a TTL; expiry is checked lazily on ``get`` (no
+    eviction scans). Wall-clock time is used because entries outlive the
+    process that wrote them.
+    """
     
     def __init__(self, cache_dir: str = "cache"):
         self.cache_dir = Path(cache_dir)
@@ -203,22 +225,29 @@ class CacheManager:
         return self.cache_dir / f"{key}.pkl"
     
     def get(self, key: str) -> Any | None:
-        """Get cached data."""
+        """Get cached data (None if missing or expired)."""
         cache_path = self.get_cache_path(key)
         if cache_path.exists():
             try:
                 with cache_path.open('rb') as f:
-                    return pickle.load(f)
+                    entry = pickle.load(f)
             except Exception:
                 return None
+            if not isinstance(entry, _CacheEntry):
+                return entry  # written before TTL support
+            if entry.expires_at is not None and entry.expires_at <= time.time():
+                cache_path.unlink(missing_ok=True)
+                return None
+            return entry.data
         return None
     
-    def set(self, key: str, data: Any):
-        """Cache data."""
+    def set(self, key: str, data: Any, ttl: float | None = None):
+        """Cache data, optionally expiring after ``ttl`` seconds."""
         cache_path = self.get_cache_path(key)
+        expires_at = time.time() + ttl if ttl is not None else None
         try:
             with cache_path.open('wb') as f:
-                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(_CacheEntry(data, expires_at), f, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception as e:
             print(f"Error caching data: {e}")
     
@@ -17,6 +17,9 @@ import re
 from ..core.contextual_forgetting import ContextualForgettingManager
 from .contextual_forget_engine import ContextualForgetEngine
 
+# IFC GUID (22자) 패턴
+_IFC_GUID_RE = re.compile(r'\b[A-Za-z0-9]{22}\b')
+
 
 class AdaptiveRetrievalStrategy:
     """적응적 검색 전략"""
@@ -70,7 +73,7 @@ class AdaptiveRetrievalStrategy:
         query_lower = query.lower()
         
         # GUID 쿼리
-        if re.search(r'\b[A-Za-z0-9]{22}\b', query):
+        if _IFC_GUID_RE.search(query):
             return 'guid'
         
         # 시간 관련 쿼리
@@ -5,59 +5,139 @@ RQ2: 맥락적 망각 메커니즘을 통합한 검색 엔진
 
 from __future__ import annotations
 
-import pickle
-from datetime import datetime, timezone
+import re
+import threading
 import time
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
 
 import networkx as nx
 
-from ..core.contextual_forgetting import ContextualForgettingManager, AdaptiveForgettingPolicy
-from ..core.forgetting import expired
+from ..core.contextual_forgetting import (
+    AdaptiveForgettingPolicy,
+    ContextualForgettingManager,
+    create_contextual_forgetting_manager,
+)
 from .advanced_query import AdvancedQueryEngine
 
+# GUID 패턴 (쿼리 타입 감지/추출 공용)
+_GUID_RE = re.compile(r'([A-Za-z0-9]{8}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{12})')
+
+# 작성자 토큰 접두사
+_AUTHOR_PREFIXES = ('engineer_', 'architect_', 'user_')
+
+
+def _elapsed_seconds(start_ns: int) -> float:
+    """시작 시각(monotonic ns) 이후 경과 시간 (초, 최소 0.1ms)"""
+    return max((time.monotonic_ns() - start_ns) * 1e-9, 0.0001)
+
+
+def _copy_response(response: dict[str, Any]) -> dict[str, Any]:
+    """캐시 응답 사본 (entities/결과 리스트와 각 결과 dict까지 새로 만들어 캐시와 공유하지 않음)"""
+    details = response['details']
+    return {
+        **response,
+        'entities': list(response['entities']),
+        'details': {
+            **details,
+            'results': [dict(doc) for doc in details['results']],
+            'contextual_scores': list(details['contextual_scores'])
+        }
+    }
+
+
+@dataclass(frozen=True)
+class QueryFeatures:
+    """쿼리 한 건에서 한 번만 계산해 공유하는 특징"""
+    raw: str
+    lower: str
+    tokens: tuple[str, ...]
+    guid: str | None
+    author: str | None
+
+
+class _MetricsAccumulator:
+    """쿼리 성능 누적기 (합계만 유지하고 평균은 조회 시 계산)"""
+    
+    __slots__ = ('relevance_sum', 'response_time_sum', 'successful_queries', 'total_queries')
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.total_queries = 0
+        self.successful_queries = 0
+        self.response_time_sum = 0.0
+        self.relevance_sum = 0.0
+    
+    def as_dict(self) -> dict[str, Any]:
+        total = max(self.total_queries, 1)
+        return {
+            'total_queries': self.total_queries,
+            'successful_queries': self.successful_queries,
+            'average_response_time': self.response_time_sum / total,
+            'average_relevance_score': self.relevance_sum / total
+        }
+
 
 class ContextualForgetEngine(AdvancedQueryEngine):
     """맥락적 망각을 통합한 ContextualForget 엔진"""
     
     def __init__(self, 
                  graph: nx.DiGraph,
-                 forgetting_manager: Optional[ContextualForgettingManager] = None,
-                 enable_contextual_forgetting: bool = True):
+                 forgetting_manager: ContextualForgettingManager | None = None,
+                 enable_contextual_forgetting: bool = True,
+                 max_workers: int | None = None,
+                 query_history_size: int = 1024,
+                 query_cache_size: int = 4096,
+                 query_cache_ttl: float | None = None):
         """
         Args:
             graph: NetworkX 그래프
             forgetting_manager: 맥락적 망각 관리자
             enable_contextual_forgetting: 맥락적 망각 활성화 여부
+            max_workers: 배치 쿼리용 스레드 수 (None이면 기본값)
+            query_history_size: 보관할 최근 쿼리 기록 수
+            query_cache_size: 망각 미적용 쿼리 응답 LRU 캐시 크기 (0이면 비활성화)
+            query_cache_ttl: 캐시된 응답의 유효 시간 (초, None이면 그래프 변경 전까지 유지)
         """
         super().__init__(graph)
         
         self.enable_contextual_forgetting = enable_contextual_forgetting
         
+        # 배치 쿼리용 스레드 풀 (지연 생성) 및 망각 상태 보호용 락
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._state_lock = threading.RLock()
+        
         if forgetting_manager is None:
-            from ..core.contextual_forgetting import create_contextual_forgetting_manager
             self.forgetting_manager = create_contextual_forgetting_manager()
         else:
             self.forgetting_manager = forgetting_manager
             
         self.adaptive_policy = AdaptiveForgettingPolicy(self.forgetting_manager)
+        self._reset_weights_cache()
         
         # 성능 추적
-        self.query_history = []
-        self.performance_metrics = {
-            'total_queries': 0,
-            'successful_queries': 0,
-            'average_response_time': 0.0,
-            'average_relevance_score': 0.0
-        }
+        self.query_history: deque = deque(maxlen=query_history_size)
+        self._metrics = _MetricsAccumulator()
+        
+        # 망각 미적용 쿼리 응답 캐시 (LRU, 그래프 변경 시 무효화)
+        self.query_cache_size = query_cache_size
+        self.query_cache_ttl = query_cache_ttl
+        self._query_cache: OrderedDict = OrderedDict()  # (query_type, query) -> (저장 시각, 응답)
+        self._query_cache_stamp = self._graph_stamp()
     
     def find_by_keywords_with_forgetting(self, 
-                                       keywords: List[str], 
+                                       keywords: list[str], 
                                        ttl: int = 0,
-                                       apply_forgetting: bool = True) -> List[Dict[str, Any]]:
-        """키워드 검색 with 맥락적 망각"""
-        start_time = time.perf_counter()
+                                       apply_forgetting: bool = True,
+                                       track: bool = True) -> list[dict[str, Any]]:
+        """키워드 검색 with 맥락적 망각 (track=False면 성능 메트릭을 기록하지 않음)"""
+        start_ns = time.monotonic_ns()
         
         # 기본 키워드 검색 수행
         results = self.find_by_keywords(keywords, ttl)
@@ -65,34 +145,25 @@ class ContextualForgetEngine(AdvancedQueryEngine):
         if not self.enable_contextual_forgetting or not apply_forgetting:
             return results
         
-        # 맥락 정보 업데이트 (문서에 doc_id 추가)
-        docs_with_id = []
-        for doc in results:
-            doc_copy = doc.copy()
-            if 'doc_id' not in doc_copy:
-                doc_copy['doc_id'] = doc_copy.get('topic_id', doc_copy.get('guid', ''))
-            docs_with_id.append(doc_copy)
-        
-        self.forgetting_manager.update_context(
-            query=" ".join(keywords),
-            retrieved_docs=docs_with_id
-        )
-        
-        # 맥락적 망각 적용
-        filtered_results = self.forgetting_manager.apply_contextual_forgetting(results)
-        
-        # 성능 메트릭 업데이트
-        self._update_performance_metrics(start_time, len(filtered_results), len(results))
-        
-        return filtered_results
+        return self._apply_forgetting(" ".join(keywords), results, start_ns, track)
     
     def find_by_guid_with_forgetting(self, 
                                    guid: str, 
                                    ttl: int = 0,
-                                   apply_forgetting: bool = True) -> List[Dict[str, Any]]:
-        """GUID 검색 with 맥락적 망각"""
-        start_time = time.perf_counter()
+                                   apply_forgetting: bool = True,
+                                   track: bool = True) -> list[dict[str, Any]]:
+        """GUID 검색 with 맥락적 망각 (track=False면 성능 메트릭을 기록하지 않음)"""
+        start_ns = time.monotonic_ns()
+        
+        results = self._search_guid(guid, ttl)
         
+        if not self.enable_contextual_forgetting or not apply_forgetting:
+            return results
+        
+        return self._apply_forgetting(f"GUID: {guid}", results, start_ns, track)
+    
+    def _search_guid(self, guid: str, ttl: int = 0) -> list[dict[str, Any]]:
+        """BCF 노드 직접 매칭 + IFC 노드 기반 GUID 검색 (그래프 읽기 전용)"""
         # BCF 노드에서 직접 GUID 검색
         results = []
         bcf_node = ("BCF", guid)
@@ -114,36 +185,15 @@ class ContextualForgetEngine(AdvancedQueryEngine):
         ifc_results = self.find_by_guid(guid, ttl)
         results.extend(ifc_results)
         
-        if not self.enable_contextual_forgetting or not apply_forgetting:
-            return results
-        
-        # 맥락 정보 업데이트 (문서에 doc_id 추가)
-        docs_with_id = []
-        for doc in results:
-            doc_copy = doc.copy()
-            if 'doc_id' not in doc_copy:
-                doc_copy['doc_id'] = doc_copy.get('topic_id', doc_copy.get('guid', ''))
-            docs_with_id.append(doc_copy)
-        
-        self.forgetting_manager.update_context(
-            query=f"GUID: {guid}",
-            retrieved_docs=docs_with_id
-        )
-        
-        # 맥락적 망각 적용
-        filtered_results = self.forgetting_manager.apply_contextual_forgetting(results)
-        
-        # 성능 메트릭 업데이트
-        self._update_performance_metrics(start_time, len(filtered_results), len(results))
-        
-        return filtered_results
+        return results
     
     def find_by_author_with_forgetting(self, 
                                      author: str, 
                                      ttl: int = 0,
-                                     apply_forgetting: bool = True) -> List[Dict[str, Any]]:
-        """작성자 검색 with 맥락적 망각"""
-        start_time = time.perf_counter()
+                                     apply_forgetting: bool = True,
+                                     track: bool = True) -> list[dict[str, Any]]:
+        """작성자 검색 with 맥락적 망각 (track=False면 성능 메트릭을 기록하지 않음)"""
+        start_ns = time.monotonic_ns()
         
         # 기본 작성자 검색 수행
         results = self.find_by_author(author, ttl)
@@ -151,49 +201,87 @@ class ContextualForgetEngine(AdvancedQueryEngine):
         if not self.enable_contextual_forgetting or not apply_forgetting:
             return results
         
-        # 맥락 정보 업데이트 (문서에 doc_id 추가)
-        docs_with_id = []
-        for doc in results:
-            doc_copy = doc.copy()
-            if 'doc_id' not in doc_copy:
-                doc_copy['doc_id'] = doc_copy.get('topic_id', doc_copy.get('guid', ''))
-            docs_with_id.append(doc_copy)
-        
-        self.forgetting_manager.update_context(
-            query=f"Author: {author}",
-            retrieved_docs=docs_with_id
-        )
-        
-        # 맥락적 망각 적용
-        filtered_results = self.forgetting_manager.apply_contextual_forgetting(results)
+        return self._apply_forgetting(f"Author: {author}", results, start_ns, track)
+    
+    def _apply_forgetting(self,
+                          context_query: str,
+                          results: list[dict[str, Any]],
+                          start_ns: int,
+                          track: bool = True) -> list[dict[str, Any]]:
+        """검색 결과에 맥락 업데이트 + 맥락적 망각 적용 (상태 변경 구간)
+        
+        결과가 없으면 맥락 기록/망각 계산을 건너뛰고 메트릭만 기록합니다.
+        """
+        if not results:
+            if track:
+                with self._state_lock:
+                    self._update_performance_metrics(_elapsed_seconds(start_ns), 0, 0)
+            return results
         
-        # 성능 메트릭 업데이트
-        self._update_performance_metrics(start_time, len(filtered_results), len(results))
+        with self._state_lock:
+            # 맥락 정보 업데이트 (문서에 doc_id 추가)
+            self.forgetting_manager.update_context(
+                query=context_query,
+                retrieved_docs=self._ensure_doc_ids(results)
+            )
+            
+            # 맥락적 망각 적용
+            filtered_results = self.forgetting_manager.apply_contextual_forgetting(results)
+            
+            # 성능 메트릭 업데이트
+            if track:
+                response_time = _elapsed_seconds(start_ns)
+                self._update_performance_metrics(response_time, len(filtered_results), len(results))
         
         return filtered_results
     
-    def _detect_query_type(self, query: str) -> str:
-        """쿼리 타입 자동 감지"""
-        import re
+    @staticmethod
+    def _ensure_doc_ids(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """결과 문서에 ``doc_id``를 제자리에서 채워 넣고 같은 리스트를 반환
         
+        ``results``는 find_by_* 가 새로 생성한 dict 목록이라 공유되지 않으므로
+        복사 없이 수정합니다.
+        """
+        for doc in results:
+            if 'doc_id' not in doc:
+                doc['doc_id'] = doc.get('topic_id', doc.get('guid', ''))
+        return results
+    
+    def _build_features(self, query: str) -> QueryFeatures:
+        """쿼리 특징을 한 번에 계산 (소문자화/토큰화/GUID 검색은 쿼리당 1회)"""
+        guid_match = _GUID_RE.search(query)
+        tokens = tuple(query.split())
+        author = next((word for word in tokens if word.startswith(_AUTHOR_PREFIXES)), None)
+        
+        return QueryFeatures(
+            raw=query,
+            lower=query.lower(),
+            tokens=tokens,
+            guid=guid_match.group() if guid_match else None,
+            author=author
+        )
+    
+    def _classify(self, features: QueryFeatures) -> str:
+        """쿼리 타입 자동 감지"""
         # GUID 쿼리 감지
-        guid_pattern = r'([A-Za-z0-9]{8}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{12})'
-        if re.search(guid_pattern, query):
+        if features.guid:
             return "guid"
         
+        query_lower = features.lower
+        
         # 시간 관련 쿼리 감지
         temporal_keywords = ['최근', '이전', '생성', '날짜', '일', '주', '월', '년', 'recent', 'ago', 'created', 'date']
-        if any(keyword in query.lower() for keyword in temporal_keywords):
+        if any(keyword in query_lower for keyword in temporal_keywords):
             return "temporal"
         
         # 작성자 관련 쿼리 감지
         author_keywords = ['작성', 'author', 'engineer', 'architect']
-        if any(keyword in query.lower() for keyword in author_keywords):
+        if any(keyword in query_lower for keyword in author_keywords):
             return "author"
         
         # 복잡한 쿼리 감지 (여러 조건이 포함된 경우)
         complex_keywords = ['그리고', '또는', '하지만', 'and', 'or', 'but', 'with', 'without']
-        if any(keyword in query.lower() for keyword in complex_keywords):
+        if any(keyword in query_lower for keyword in complex_keywords):
             return "complex"
         
         # 기본값: 일반 키워드 쿼리
@@ -202,62 +290,249 @@ class ContextualForgetEngine(AdvancedQueryEngine):
     def contextual_query(self, 
                         query: str, 
                         query_type: str = "auto",
-                        apply_forgetting: bool = True) -> Dict[str, Any]:
-        """맥락적 쿼리 처리"""
-        start_time = time.perf_counter()
+                        apply_forgetting: bool = True) -> dict[str, Any]:
+        """맥락적 쿼리 처리
+        
+        망각을 적용하지 않는 쿼리는 그래프가 변하지 않는 한 결과가 같으므로
+        ``(query_type, query)`` 단위로 응답을 캐시합니다. 망각 관리자는 상태를
+        가지므로 망각을 적용하는 쿼리는 캐시하지 않습니다.
+        """
+        start_ns = time.monotonic_ns()
+        
+        cache_key = (query_type, query.strip())
+        use_cache = self.query_cache_size > 0 and not (apply_forgetting and self.enable_contextual_forgetting)
+        if use_cache:
+            cached = self._cached_response(cache_key, query, start_ns)
+            if cached is not None:
+                return cached
+        
+        resolved_type, context_query, results = self._retrieve(query, query_type)
+        
+        response = self._finalize_query(query, resolved_type, context_query, results,
+                                        apply_forgetting, start_ns)
+        
+        if use_cache:
+            with self._state_lock:
+                # 호출자가 응답을 수정해도 캐시가 바뀌지 않도록 사본을 저장
+                self._query_cache[cache_key] = (time.monotonic_ns(), _copy_response(response))
+                self._query_cache.move_to_end(cache_key)
+                if len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        
+        return response
+    
+    def invalidate_query_cache(self):
+        """쿼리 응답 캐시 비우기 (그래프 갱신 후 호출)"""
+        with self._state_lock:
+            self._query_cache.clear()
+            self._query_cache_stamp = self._graph_stamp()
+    
+    def _graph_stamp(self) -> tuple[int, int]:
+        """노드/엣지 수 기반의 간단한 그래프 변경 감지 값"""
+        return self.graph.number_of_nodes(), self.graph.number_of_edges()
+    
+    def _cached_response(self,
+                         cache_key: tuple[str, str],
+                         query: str,
+                         start_ns: int) -> dict[str, Any] | None:
+        """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+        with self._state_lock:
+            stamp = self._graph_stamp()
+            if stamp != self._query_cache_stamp:
+                self._query_cache.clear()
+                self._query_cache_stamp = stamp
+                return None
+            
+            entry = self._query_cache.get(cache_key)
+            if entry is None:
+                return None
+            cached_at, cached = entry
+            if self.query_cache_ttl is not None and (start_ns - cached_at) * 1e-9 >= self.query_cache_ttl:
+                del self._query_cache[cache_key]
+                return None
+            self._query_cache.move_to_end(cache_key)
+            
+            details = cached['details']
+            query_type = details['query_type']
+            result_count = cached['result_count']
+            
+            self._apply_adaptive_weights(query_type)
+            response_time = _elapsed_seconds(start_ns)
+            self._record_query(query, query_type, result_count, result_count, response_time)
+        
+        response = _copy_response(cached)
+        response['details'].update(query=query, response_time=response_time)
+        return response
+    
+    def batch_contextual_query(self, 
+                               queries: list[str], 
+                               query_type: str = "auto",
+                               apply_forgetting: bool = True) -> list[dict[str, Any]]:
+        """배치 맥락적 쿼리 처리
+        
+        그래프 검색(읽기 전용)은 스레드 풀에서 병렬로 수행하고, 상태를 변경하는
+        맥락 업데이트/망각 적용은 입력 순서대로 직렬 수행하므로 결과는
+        ``contextual_query``를 순서대로 호출한 것과 동일합니다.
+        """
+        if not queries:
+            return []
+        
+        executor = self._get_executor()
+        retrieved = list(executor.map(lambda q: self._timed_retrieve(q, query_type), queries))
+        
+        responses = []
+        pairs = zip(queries, retrieved, strict=True)
+        for query, (elapsed_ns, (resolved_type, context_query, results)) in pairs:
+            # 검색 소요 시간을 응답 시간에 포함시키기 위해 시작 시각을 보정
+            start_ns = time.monotonic_ns() - elapsed_ns
+            responses.append(self._finalize_query(query, resolved_type, context_query, results,
+                                                  apply_forgetting, start_ns))
+        
+        return responses
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """배치 쿼리용 스레드 풀 반환 (최초 호출 시 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="ctxf-query")
+        return self._executor
+    
+    def close(self):
+        """배치 쿼리용 스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _timed_retrieve(self, query: str, query_type: str):
+        """검색 수행 + 소요 시간(ns) 측정"""
+        start_ns = time.monotonic_ns()
+        retrieved = self._retrieve(query, query_type)
+        return time.monotonic_ns() - start_ns, retrieved
+    
+    def _retrieve(self, query: str, query_type: str):
+        """쿼리 타입 감지 및 그래프 검색 (망각 상태를 변경하지 않음)
+        
+        Returns:
+            (쿼리 타입, 맥락 업데이트용 쿼리 문자열 또는 None, 검색 결과)
+        """
+        features = self._build_features(query)
         
         # 쿼리 타입 자동 감지
         if query_type == "auto":
-            query_type = self._detect_query_type(query)
-        
-        # 쿼리 타입에 따른 적응적 가중치 적용
-        if self.enable_contextual_forgetting:
-            adaptive_weights = self.adaptive_policy.get_adaptive_weights(query_type)
-            self.forgetting_manager.usage_weight = adaptive_weights['usage_weight']
-            self.forgetting_manager.recency_weight = adaptive_weights['recency_weight']
-            self.forgetting_manager.relevance_weight = adaptive_weights['relevance_weight']
+            query_type = self._classify(features)
         
         # 쿼리 타입에 따른 검색 수행
         if query_type == "guid":
-            # GUID 패턴 추출
-            import re
-            guid_pattern = r'([A-Za-z0-9]{8}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{12})'
-            guid_match = re.search(guid_pattern, query)
-            if guid_match:
-                results = self.find_by_guid_with_forgetting(guid_match.group(), apply_forgetting=apply_forgetting)
-            else:
-                results = []
+            if features.guid:
+                return query_type, f"GUID: {features.guid}", self._search_guid(features.guid)
+            return query_type, None, []
         elif query_type == "author":
-            # 작성자 추출
-            author_keywords = [word for word in query.split() if word.startswith(('engineer_', 'architect_', 'user_'))]
-            if author_keywords:
-                results = self.find_by_author_with_forgetting(author_keywords[0], apply_forgetting=apply_forgetting)
-            else:
-                results = []
+            if features.author:
+                return query_type, f"Author: {features.author}", self.find_by_author(features.author)
+            return query_type, None, []
         else:
-            # 일반 키워드 검색
-            keywords = query.split()
-            results = self.find_by_keywords_with_forgetting(keywords, apply_forgetting=apply_forgetting)
+            # 일반 키워드 검색 (토큰화 결과를 그대로 사용, 재분리/복사 없음)
+            tokens = features.tokens
+            return query_type, " ".join(tokens), self.find_by_keywords(tokens)
+    
+    def _finalize_query(self,
+                        query: str,
+                        query_type: str,
+                        context_query: str | None,
+                        results: list[dict[str, Any]],
+                        apply_forgetting: bool,
+                        start_ns: int) -> dict[str, Any]:
+        """적응적 가중치/맥락적 망각 적용 후 표준 응답 생성
+        
+        쿼리당 성능 메트릭은 여기서 한 번만 기록합니다.
+        """
+        original_count = len(results)
         
-        # 응답 시간 계산
-        response_time = max(time.perf_counter() - start_time, 0.0001)
+        with self._state_lock:
+            self._apply_adaptive_weights(query_type)
+            
+            if self.enable_contextual_forgetting and apply_forgetting and context_query is not None:
+                results = self._apply_forgetting(context_query, results, start_ns, track=False)
+            
+            # 응답 시간 계산 및 성능 메트릭 업데이트
+            response_time = _elapsed_seconds(start_ns)
+            self._record_query(query, query_type, len(results), original_count, response_time)
         
-        # 신뢰도 계산
-        contextual_scores = [doc.get('contextual_score', 0.0) for doc in results]
-        if contextual_scores and len(results) > 0:
-            avg_contextual = sum(contextual_scores) / len(contextual_scores)
-            result_ratio = min(1.0, len(results) / 10.0)
-            confidence = avg_contextual * 0.7 + result_ratio * 0.3
-        else:
-            confidence = 0.0
-
-        # entities 리스트 추출
+        return self._build_response(query, query_type, results, apply_forgetting, response_time)
+    
+    def _reset_weights_cache(self):
+        """쿼리 타입별 가중치 캐시 초기화 (현재 관리자 가중치를 기본 가중치로 사용)"""
+        manager = self.forgetting_manager
+        self._base_weights = (manager.usage_weight, manager.recency_weight, manager.relevance_weight)
+        self._weights_cache: dict[str, tuple[float, float, float]] = {}
+        self._applied_weights: tuple[float, float, float] | None = self._base_weights
+    
+    def _adaptive_weights(self, query_type: str) -> tuple[float, float, float]:
+        """쿼리 타입별 가중치 (타입당 한 번만 계산)"""
+        weights = self._weights_cache.get(query_type)
+        if weights is None:
+            # 이전 쿼리가 남긴 가중치가 아닌 기본 가중치를 기준으로 계산
+            manager = self.forgetting_manager
+            manager.usage_weight, manager.recency_weight, manager.relevance_weight = self._base_weights
+            self._applied_weights = self._base_weights
+            adaptive_weights = self.adaptive_policy.get_adaptive_weights(query_type)
+            weights = (adaptive_weights['usage_weight'],
+                       adaptive_weights['recency_weight'],
+                       adaptive_weights['relevance_weight'])
+            self._weights_cache[query_type] = weights
+        return weights
+    
+    def _apply_adaptive_weights(self, query_type: str):
+        """쿼리 타입에 따른 적응적 가중치 적용"""
+        if self.enable_contextual_forgetting:
+            weights = self._adaptive_weights(query_type)
+            if weights != self._applied_weights:
+                manager = self.forgetting_manager
+                manager.usage_weight, manager.recency_weight, manager.relevance_weight = weights
+                self._applied_weights = weights
+    
+    def _record_query(self,
+                      query: str,
+                      query_type: str,
+                      result_count: int,
+                      original_count: int,
+                      response_time: float):
+        """쿼리 1건의 성능 메트릭 및 기록 저장"""
+        self._update_performance_metrics(response_time, result_count, original_count)
+        self.query_history.append({
+            'query': query,
+            'query_type': query_type,
+            'result_count': result_count,
+            'response_time': response_time
+        })
+    
+    def _build_response(self,
+                        query: str,
+                        query_type: str,
+                        results: list[dict[str, Any]],
+                        apply_forgetting: bool,
+                        response_time: float) -> dict[str, Any]:
+        """표준 응답 형식 생성"""
+        # 맥락 점수 합계와 entities 리스트를 한 번의 순회로 추출
+        contextual_scores = []
         entities = []
+        score_sum = 0.0
         for doc in results:
+            value = doc.get('contextual_score', 0.0)
+            score_sum += value
+            contextual_scores.append(value)
+            
             entity_id = doc.get('doc_id') or doc.get('topic_id') or doc.get('guid', '')
             if entity_id:
                 entities.append(entity_id)
         
+        # 신뢰도 계산
+        n = len(results)
+        if n:
+            confidence = (score_sum / n) * 0.7 + min(1.0, n / 10.0) * 0.3
+        else:
+            confidence = 0.0
+        
         # 답변 생성 (간단한 요약)
         if results:
             answer = f"{len(results)}개의 관련 항목을 찾았습니다."
@@ -281,35 +556,29 @@ class ContextualForgetEngine(AdvancedQueryEngine):
             }
         }
         
-        # 성능 메트릭 업데이트
-        self._update_performance_metrics(start_time, len(results), len(results))
-        
         return response
     
-    def _update_performance_metrics(self, start_time: datetime, filtered_count: int, original_count: int):
+    def recent_queries(self, n: int = 10) -> list[dict[str, Any]]:
+        """최근 n개의 쿼리 기록 반환 (오래된 순)"""
+        return list(islice(self.query_history, max(0, len(self.query_history) - n), None))
+    
+    @property
+    def performance_metrics(self) -> dict[str, Any]:
+        """성능 메트릭 (평균은 누적 합계에서 계산)"""
+        return self._metrics.as_dict()
+    
+    def _update_performance_metrics(self, response_time: float, filtered_count: int, original_count: int):
         """성능 메트릭 업데이트"""
-        response_time = max(time.perf_counter() - start_time, 0.0001)
-        
-        self.performance_metrics['total_queries'] += 1
-        if filtered_count > 0:
-            self.performance_metrics['successful_queries'] += 1
-        
-        # 평균 응답 시간 업데이트
-        total_queries = self.performance_metrics['total_queries']
-        current_avg = self.performance_metrics['average_response_time']
-        self.performance_metrics['average_response_time'] = (
-            (current_avg * (total_queries - 1) + response_time) / total_queries
-        )
+        metrics = self._metrics
+        metrics.total_queries += 1
+        metrics.response_time_sum += response_time
         
-        # 평균 관련성 점수 업데이트
+        # 관련성 점수 누적 (결과가 있는 쿼리만)
         if filtered_count > 0:
-            relevance_score = filtered_count / max(original_count, 1)
-            current_avg_relevance = self.performance_metrics['average_relevance_score']
-            self.performance_metrics['average_relevance_score'] = (
-                (current_avg_relevance * (total_queries - 1) + relevance_score) / total_queries
-            )
+            metrics.successful_queries += 1
+            metrics.relevance_sum += filtered_count / max(original_count, 1)
     
-    def get_forgetting_statistics(self) -> Dict[str, Any]:
+    def get_forgetting_statistics(self) -> dict[str, Any]:
         """망각 통계 반환"""
         if not self.enable_contextual_forgetting:
             return {'forgetting_enabled': False}
@@ -328,39 +597,37 @@ class ContextualForgetEngine(AdvancedQueryEngine):
         """망각 정책 적응"""
         if self.enable_contextual_forgetting:
             self.adaptive_policy.adapt_threshold(performance_feedback)
+            self._weights_cache.clear()
+            self.invalidate_query_cache()
     
-    def save_forgetting_state(self, filepath: str):
-        """망각 상태 저장"""
+    def save_forgetting_state(self, filepath: str, legacy: bool = False):
+        """망각 상태 저장 (legacy=True면 기존 pickle 형식)"""
         if self.enable_contextual_forgetting:
-            self.forgetting_manager.save_state(filepath)
+            self.forgetting_manager.save_state(filepath, legacy=legacy)
     
-    def load_forgetting_state(self, filepath: str):
-        """망각 상태 로드"""
+    def load_forgetting_state(self, filepath: str, legacy: bool = False):
+        """망각 상태 로드 (legacy=True면 기존 pickle 형식)"""
         if self.enable_contextual_forgetting:
-            self.forgetting_manager.load_state(filepath)
+            self.forgetting_manager.load_state(filepath, legacy=legacy)
     
     def reset_forgetting_state(self):
-        """망각 상태 초기화"""
+        """망각 상태 초기화 (관리자/정책 객체는 재사용하고 설정값은 유지)"""
         if self.enable_contextual_forgetting:
-            from ..core.contextual_forgetting import create_contextual_forgetting_manager
-            self.forgetting_manager = create_contextual_forgetting_manager()
-            self.adaptive_policy = AdaptiveForgettingPolicy(self.forgetting_manager)
-            self.performance_metrics = {
-                'total_queries': 0,
-                'successful_queries': 0,
-                'average_response_time': 0.0,
-                'average_relevance_score': 0.0
-            }
+            with self._state_lock:
+                self.forgetting_manager.reset()
+                self.adaptive_policy.reset()
+                self._reset_weights_cache()
+                self.invalidate_query_cache()
+                self._metrics.reset()
+                self.query_history.clear()
 
 
 def create_contextual_forget_engine(graph: nx.DiGraph, 
-                                  config: Optional[Dict[str, Any]] = None) -> ContextualForgetEngine:
+                                  config: dict[str, Any] | None = None) -> ContextualForgetEngine:
     """ContextualForget 엔진 생성"""
     if config is None:
         config = {}
     
-    from ..core.contextual_forgetting import create_contextual_forgetting_manager
-    
     forgetting_manager = create_contextual_forgetting_manager(
         config.get('forgetting_config', {})
     )
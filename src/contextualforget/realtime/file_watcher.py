@@ -1,6 +1,7 @@
 """파일 시스템 감시 모듈."""
 
 import logging
+import os
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
@@ -8,8 +9,19 @@ from enum import Enum
 from pathlib import Path
 from threading import Event, Thread
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+    Observer = None
+
 logger = logging.getLogger(__name__)
 
+WATCHED_SUFFIXES = ('.ifc', '.bcfzip')
+
 
 class FileChangeType(Enum):
     """파일 변경 유형."""
@@ -27,23 +39,59 @@ class FileChangeEvent:
     file_type: str  # 'ifc' or 'bcf'
 
 
+class _NativeEventHandler(FileSystemEventHandler):
+    """watchdog 이벤트를 FileWatcher 이벤트로 변환."""
+    
+    def __init__(self, watcher: 'FileWatcher'):
+        super().__init__()
+        self.watcher = watcher
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher._on_native_change(event.src_path, FileChangeType.CREATED)
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher._on_native_change(event.src_path, FileChangeType.MODIFIED)
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.watcher._on_native_change(event.src_path, FileChangeType.DELETED)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher._on_native_change(event.src_path, FileChangeType.DELETED)
+            self.watcher._on_native_change(event.dest_path, FileChangeType.CREATED)
+
+
 class FileWatcher:
-    """파일 시스템 감시기 - IFC 및 BCF 파일 변경 감지."""
+    """파일 시스템 감시기 - IFC 및 BCF 파일 변경 감지.
     
-    def __init__(self, watch_dirs: list[Path], poll_interval: float = 2.0):
+    watchdog이 설치되어 있으면 OS 네이티브 알림(inotify/FSEvents/
+    ReadDirectoryChangesW)을 사용하고, 그렇지 않거나 ``use_native=False``인
+    경우(예: 네트워크 파일 시스템) 폴링으로 동작합니다.
+    """
+    
+    def __init__(self, watch_dirs: list[Path], poll_interval: float = 2.0, use_native: bool = True):
         """
         Args:
             watch_dirs: 감시할 디렉토리 목록
             poll_interval: 폴링 간격 (초)
+            use_native: OS 네이티브 파일 이벤트 사용 여부 (watchdog 필요)
         """
         self.watch_dirs = [Path(d) for d in watch_dirs]
         self.poll_interval = poll_interval
+        self.use_native = use_native and WATCHDOG_AVAILABLE
         self.callbacks: list[Callable[[FileChangeEvent], None]] = []
         
-        # 파일 상태 추적
-        self.file_states: dict[Path, float] = {}  # path -> mtime
+        # 파일 상태 추적 (경로 문자열 키: Path보다 해시/비교가 빠르며 이벤트 생성 시에만 Path로 변환)
+        self.file_states: dict[str, float] = {}  # path -> mtime
         self._stop_event = Event()
         self._thread: Thread = None
+        self._observer = None
+        
+        if use_native and not WATCHDOG_AVAILABLE:
+            logger.warning("watchdog이 설치되지 않아 폴링 방식으로 동작합니다")
         
         logger.info(f"FileWatcher 초기화: {len(self.watch_dirs)}개 디렉토리 감시")
     
@@ -52,8 +100,8 @@ class FileWatcher:
         self.callbacks.append(callback)
         logger.info(f"콜백 등록: {callback.__name__}")
     
-    def _scan_files(self) -> dict[Path, float]:
-        """현재 파일 상태 스캔."""
+    def _scan_files(self) -> dict[str, float]:
+        """현재 파일 상태 스캔 (감시 디렉토리당 한 번의 scandir 순회)."""
         current_files = {}
         
         for watch_dir in self.watch_dirs:
@@ -61,57 +109,117 @@ class FileWatcher:
                 logger.warning(f"감시 디렉토리가 존재하지 않음: {watch_dir}")
                 continue
             
-            # IFC 파일 스캔
-            for ifc_file in watch_dir.glob("**/*.ifc"):
-                if ifc_file.is_file():
-                    current_files[ifc_file] = ifc_file.stat().st_mtime
-            
-            # BCF 파일 스캔
-            for bcf_file in watch_dir.glob("**/*.bcfzip"):
-                if bcf_file.is_file():
-                    current_files[bcf_file] = bcf_file.stat().st_mtime
+            # IFC/BCF 파일을 확장자로 바로 걸러내며 스택 기반으로 순회
+            stack = [str(watch_dir)]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.endswith(WATCHED_SUFFIXES) and entry.is_file():
+                                current_files[entry.path] = entry.stat().st_mtime
+                except OSError as e:
+                    logger.warning(f"디렉토리 스캔 오류: {e}")
         
         return current_files
     
-    def _detect_changes(self, current_files: dict[Path, float]) -> list[FileChangeEvent]:
+    def _detect_changes(self, current_files: dict[str, float]) -> list[FileChangeEvent]:
         """파일 변경 감지."""
+        previous_files = self.file_states
+        
+        # 대부분의 폴링 주기에는 변경이 없으므로 C 수준 dict 비교로 먼저 확인
+        if current_files == previous_files:
+            return []
+        
         events = []
-        current_paths = set(current_files.keys())
-        previous_paths = set(self.file_states.keys())
+        now = datetime.now()
         
-        # 새로 생성된 파일
-        for path in current_paths - previous_paths:
-            file_type = 'ifc' if path.suffix == '.ifc' else 'bcf'
+        # 새로 생성되거나 수정된 파일 (현재 상태 한 번 순회)
+        for path, mtime in current_files.items():
+            previous_mtime = previous_files.get(path)
+            if previous_mtime is None:
+                change_type = FileChangeType.CREATED
+            elif previous_mtime != mtime:
+                change_type = FileChangeType.MODIFIED
+            else:
+                continue
             events.append(FileChangeEvent(
-                path=path,
-                change_type=FileChangeType.CREATED,
-                timestamp=datetime.now(),
-                file_type=file_type
+                path=Path(path),
+                change_type=change_type,
+                timestamp=now,
+                file_type='ifc' if path.endswith('.ifc') else 'bcf'
             ))
         
-        # 수정된 파일
-        for path in current_paths & previous_paths:
-            if current_files[path] != self.file_states[path]:
-                file_type = 'ifc' if path.suffix == '.ifc' else 'bcf'
-                events.append(FileChangeEvent(
-                    path=path,
-                    change_type=FileChangeType.MODIFIED,
-                    timestamp=datetime.now(),
-                    file_type=file_type
-                ))
-        
         # 삭제된 파일
-        for path in previous_paths - current_paths:
-            file_type = 'ifc' if path.suffix == '.ifc' else 'bcf'
+        for path in previous_files.keys() - current_files.keys():
             events.append(FileChangeEvent(
-                path=path,
+                path=Path(path),
                 change_type=FileChangeType.DELETED,
-                timestamp=datetime.now(),
-                file_type=file_type
+                timestamp=now,
+                file_type='ifc' if path.endswith('.ifc') else 'bcf'
             ))
         
         return events
     
+    def _dispatch(self, event: FileChangeEvent):
+        """변경 이벤트를 등록된 콜백에 전달."""
+        logger.info(
+            f"파일 변경 감지: {event.change_type.value} - "
+            f"{event.path.name} ({event.file_type})"
+        )
+        
+        # 콜백 호출
+        for callback in self.callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"콜백 실행 오류: {e}", exc_info=True)
+    
+    def _on_native_change(self, path: str | Path, change_type: FileChangeType):
+        """네이티브 파일 이벤트 처리 (감시 대상 확장자만)."""
+        path = os.fspath(path)
+        if not path.endswith(WATCHED_SUFFIXES):
+            return
+        
+        if change_type == FileChangeType.DELETED:
+            if self.file_states.pop(path, None) is None:
+                return
+        else:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                return
+            previous_mtime = self.file_states.get(path)
+            # 한 번의 쓰기에 여러 modified 이벤트가 오는 경우 중복 제거
+            if previous_mtime == mtime:
+                return
+            change_type = FileChangeType.CREATED if previous_mtime is None else FileChangeType.MODIFIED
+            self.file_states[path] = mtime
+        
+        self._dispatch(FileChangeEvent(
+            path=Path(path),
+            change_type=change_type,
+            timestamp=datetime.now(),
+            file_type='ifc' if path.endswith('.ifc') else 'bcf'
+        ))
+    
+    def _start_native(self):
+        """watchdog Observer 기반 감시 시작."""
+        self.file_states = self._scan_files()
+        logger.info(f"초기 스캔 완료: {len(self.file_states)}개 파일")
+        
+        handler = _NativeEventHandler(self)
+        self._observer = Observer()
+        for watch_dir in self.watch_dirs:
+            if not watch_dir.exists():
+                logger.warning(f"감시 디렉토리가 존재하지 않음: {watch_dir}")
+                continue
+            self._observer.schedule(handler, str(watch_dir), recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+        logger.info("파일 감시 시작 (네이티브 이벤트)")
+    
     def _watch_loop(self):
         """파일 감시 루프."""
         logger.info("파일 감시 시작")
@@ -130,17 +238,7 @@ class FileWatcher:
                 
                 # 이벤트 처리
                 for event in events:
-                    logger.info(
-                        f"파일 변경 감지: {event.change_type.value} - "
-                        f"{event.path.name} ({event.file_type})"
-                    )
-                    
-                    # 콜백 호출
-                    for callback in self.callbacks:
-                        try:
-                            callback(event)
-                        except Exception as e:
-                            logger.error(f"콜백 실행 오류: {e}", exc_info=True)
+                    self._dispatch(event)
                 
                 # 상태 업데이트
                 self.file_states = current_files
@@ -154,10 +252,14 @@ class FileWatcher:
     
     def start(self):
         """파일 감시 시작."""
-        if self._thread and self._thread.is_alive():
+        if self.is_running():
             logger.warning("파일 감시가 이미 실행 중입니다")
             return
         
+        if self.use_native:
+            self._start_native()
+            return
+        
         self._stop_event.clear()
         self._thread = Thread(target=self._watch_loop, daemon=True)
         self._thread.start()
@@ -165,16 +267,23 @@ class FileWatcher:
     
     def stop(self):
         """파일 감시 중지."""
-        if not self._thread or not self._thread.is_alive():
+        if not self.is_running():
             logger.warning("파일 감시가 실행 중이 아닙니다")
             return
         
         logger.info("파일 감시 중지 중...")
-        self._stop_event.set()
-        self._thread.join(timeout=5.0)
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5.0)
+            self._observer = None
+        else:
+            self._stop_event.set()
+            self._thread.join(timeout=5.0)
         logger.info("파일 감시 중지 완료")
     
     def is_running(self) -> bool:
         """파일 감시 실행 여부."""
+        if self._observer is not None:
+            return self._observer.is_alive()
         return self._thread is not None and self._thread.is_alive()
 
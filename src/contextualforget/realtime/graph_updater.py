@@ -1,7 +1,10 @@
 """그래프 동적 업데이트 모듈."""
 
 import logging
+import mmap
+import os
 import pickle
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -26,6 +29,10 @@ class GraphUpdater:
         self.graph_path = Path(graph_path)
         self.processed_dir = Path(processed_dir)
         self.graph = None
+        # 그래프 로드/변경/저장 직렬화 (파싱은 락 밖에서 병렬로 수행 가능)
+        self._graph_lock = threading.RLock()
+        # 마지막 저장 이후 그래프 변경 여부 (변경이 없으면 저장 생략)
+        self._dirty = False
         
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         
@@ -33,30 +40,41 @@ class GraphUpdater:
     
     def load_graph(self) -> nx.DiGraph:
         """그래프 로드."""
-        if self.graph is None:
-            if self.graph_path.exists():
-                with self.graph_path.open('rb') as f:
-                    self.graph = pickle.load(f)
-                logger.info(f"그래프 로드 완료: {self.graph.number_of_nodes()}개 노드")
-            else:
-                self.graph = nx.DiGraph()
-                logger.info("새 그래프 생성")
-        
-        return self.graph
+        with self._graph_lock:
+            if self.graph is None:
+                if self.graph_path.exists():
+                    # 파일을 메모리 매핑해 한 번에 역직렬화 (중간 버퍼 복사 없음)
+                    with self.graph_path.open('rb') as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self.graph = pickle.loads(mm)
+                    logger.info(f"그래프 로드 완료: {self.graph.number_of_nodes()}개 노드")
+                else:
+                    self.graph = nx.DiGraph()
+                    self._dirty = True
+                    logger.info("새 그래프 생성")
+            
+            return self.graph
     
-    def save_graph(self):
-        """그래프 저장."""
+    def save_graph(self, force: bool = False):
+        """그래프 저장 (마지막 저장 이후 변경이 없으면 생략, force=True면 항상 저장)."""
         if self.graph is None:
             logger.warning("저장할 그래프가 없습니다")
             return
         
-        with self.graph_path.open('wb') as f:
-            pickle.dump(self.graph, f)
+        # 임시 파일에 쓴 뒤 교체하여 저장 중 중단되어도 기존 그래프가 손상되지 않도록 함
+        tmp_path = self.graph_path.with_name(self.graph_path.name + '.tmp')
+        with self._graph_lock:
+            if not (self._dirty or force):
+                logger.debug("그래프 변경 없음 - 저장 생략")
+                return
+            with tmp_path.open('wb') as f:
+                pickle.dump(self.graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.graph_path)
+            self._dirty = False
+            node_count = self.graph.number_of_nodes()
+            edge_count = self.graph.number_of_edges()
         
-        logger.info(
-            f"그래프 저장 완료: {self.graph.number_of_nodes()}개 노드, "
-            f"{self.graph.number_of_edges()}개 엣지"
-        )
+        logger.info(f"그래프 저장 완료: {node_count}개 노드, {edge_count}개 엣지")
     
     def process_ifc_file(self, ifc_path: Path) -> list[dict[str, Any]]:
         """IFC 파일 처리."""
@@ -84,10 +102,19 @@ class GraphUpdater:
     
     def add_ifc_nodes(self, entities: list[dict[str, Any]]):
         """IFC 엔티티를 그래프에 추가."""
+        with self._graph_lock:
+            return self._add_ifc_nodes(entities)
+    
+    def _add_ifc_nodes(self, entities: list[dict[str, Any]]):
+        """IFC 노드 추가 (그래프 락을 보유한 상태에서 호출)."""
         graph = self.load_graph()
+        now_iso = datetime.now().isoformat()  # 배치 단위로 한 번만 계산
         added_count = 0
         updated_count = 0
         
+        node_attrs = graph._node  # 노드 속성 dict (graph.nodes 뷰를 거치지 않고 직접 조회)
+        new_nodes: dict[str, dict[str, Any]] = {}  # 일괄 추가할 새 노드
+        
         for entity in entities:
             guid = entity.get('GlobalId')
             if not guid:
@@ -95,35 +122,53 @@ class GraphUpdater:
             
             node_id = f"ifc:{guid}"
             
-            if node_id in graph.nodes:
-                # 기존 노드 업데이트
-                graph.nodes[node_id].update({
+            attrs = node_attrs.get(node_id)
+            if attrs is None:
+                attrs = new_nodes.get(node_id)
+            
+            if attrs is not None:
+                # 기존 노드 (또는 이번 배치에서 추가 예정인 노드) 업데이트
+                attrs.update({
                     'type': 'ifc',
                     'name': entity.get('Name', 'Unnamed'),
                     'ifc_type': entity.get('Type', 'Unknown'),
-                    'updated_at': datetime.now().isoformat()
+                    'updated_at': now_iso
                 })
                 updated_count += 1
             else:
                 # 새 노드 추가
-                graph.add_node(node_id, **{
+                new_nodes[node_id] = {
                     'type': 'ifc',
                     'guid': guid,
                     'name': entity.get('Name', 'Unnamed'),
                     'ifc_type': entity.get('Type', 'Unknown'),
-                    'created_at': datetime.now().isoformat()
-                })
+                    'created_at': now_iso
+                }
                 added_count += 1
         
+        graph.add_nodes_from(new_nodes.items())
+        if added_count or updated_count:
+            self._dirty = True
+        
         logger.info(f"IFC 노드 추가/업데이트: +{added_count}, ~{updated_count}")
         return added_count, updated_count
     
     def add_bcf_nodes(self, topics: list[dict[str, Any]]):
         """BCF 토픽을 그래프에 추가."""
+        with self._graph_lock:
+            return self._add_bcf_nodes(topics)
+    
+    def _add_bcf_nodes(self, topics: list[dict[str, Any]]):
+        """BCF 노드 추가 (그래프 락을 보유한 상태에서 호출)."""
         graph = self.load_graph()
+        now_iso = datetime.now().isoformat()  # 배치 단위로 한 번만 계산
         added_count = 0
         updated_count = 0
         
+        node_attrs = graph._node  # 노드 속성 dict (graph.nodes 뷰를 거치지 않고 직접 조회)
+        new_nodes: dict[str, dict[str, Any]] = {}  # 일괄 추가할 새 노드
+        new_edges: dict[tuple[str, str], dict[str, Any]] = {}  # 일괄 추가할 새 엣지
+        
         for topic in topics:
             topic_id = topic.get('Guid')
             if not topic_id:
@@ -131,39 +176,47 @@ class GraphUpdater:
             
             node_id = f"bcf:{topic_id}"
             
-            if node_id in graph.nodes:
-                # 기존 노드 업데이트
-                graph.nodes[node_id].update({
+            attrs = node_attrs.get(node_id)
+            if attrs is None:
+                attrs = new_nodes.get(node_id)
+            
+            if attrs is not None:
+                # 기존 노드 (또는 이번 배치에서 추가 예정인 노드) 업데이트
+                attrs.update({
                     'type': 'bcf',
                     'title': topic.get('Title', 'Untitled'),
                     'status': topic.get('TopicStatus', 'Open'),
                     'author': topic.get('CreationAuthor', 'Unknown'),
-                    'updated_at': datetime.now().isoformat()
+                    'updated_at': now_iso
                 })
                 updated_count += 1
             else:
                 # 새 노드 추가
-                graph.add_node(node_id, **{
+                new_nodes[node_id] = {
                     'type': 'bcf',
                     'guid': topic_id,
                     'title': topic.get('Title', 'Untitled'),
                     'description': topic.get('Description', ''),
                     'status': topic.get('TopicStatus', 'Open'),
                     'author': topic.get('CreationAuthor', 'Unknown'),
-                    'created_at': topic.get('CreationDate', datetime.now().isoformat()),
+                    'created_at': topic.get('CreationDate', now_iso),
                     'importance': 0.5
-                })
+                }
                 added_count += 1
             
             # BCF-IFC 링크 생성
             related_guids = topic.get('RelatedTopics', [])
             for related_guid in related_guids:
                 ifc_node_id = f"ifc:{related_guid}"
-                if ifc_node_id in graph.nodes:
-                    if not graph.has_edge(node_id, ifc_node_id):
-                        graph.add_edge(node_id, ifc_node_id, 
-                                     relation='references',
-                                     created_at=datetime.now().isoformat())
+                if ifc_node_id in node_attrs:
+                    edge = (node_id, ifc_node_id)
+                    if edge not in new_edges and not graph.has_edge(*edge):
+                        new_edges[edge] = {'relation': 'references', 'created_at': now_iso}
+        
+        graph.add_nodes_from(new_nodes.items())
+        graph.add_edges_from((u, v, attrs) for (u, v), attrs in new_edges.items())
+        if added_count or updated_count:
+            self._dirty = True
         
         logger.info(f"BCF 노드 추가/업데이트: +{added_count}, ~{updated_count}")
         return added_count, updated_count
@@ -181,8 +234,13 @@ class GraphUpdater:
         
         return removed_count
     
-    def handle_file_change(self, event: FileChangeEvent):
-        """파일 변경 이벤트 처리."""
+    def handle_file_change(self, event: FileChangeEvent, save: bool = True):
+        """파일 변경 이벤트 처리.
+        
+        Args:
+            event: 파일 변경 이벤트
+            save: 처리 후 즉시 그래프 저장 여부 (False면 호출자가 저장 시점 결정)
+        """
         logger.info(f"파일 변경 처리: {event.change_type.value} - {event.path.name}")
         
         try:
@@ -203,7 +261,8 @@ class GraphUpdater:
                         self.add_bcf_nodes(topics)
             
             # 그래프 저장
-            self.save_graph()
+            if save:
+                self.save_graph()
             
             logger.info(f"파일 변경 처리 완료: {event.path.name}")
             
@@ -1,6 +1,9 @@
 """실시간 모니터링 시스템."""
 
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -18,7 +21,10 @@ class RealtimeMonitor:
         watch_dirs: list[Path],
         graph_path: Path,
         processed_dir: Path,
-        poll_interval: float = 2.0
+        poll_interval: float = 2.0,
+        use_native: bool = True,
+        save_delay: float = 0.5,
+        max_workers: int | None = None
     ):
         """
         Args:
@@ -26,14 +32,32 @@ class RealtimeMonitor:
             graph_path: 그래프 파일 경로
             processed_dir: 처리된 데이터 저장 디렉토리
             poll_interval: 폴링 간격 (초)
+            use_native: OS 네이티브 파일 이벤트 사용 여부 (False면 폴링)
+            save_delay: 마지막 변경 이후 그래프 저장까지 대기 시간 (초)
+            max_workers: IFC/BCF 파일 파싱용 스레드 수 (None이면 CPU 수, 최대 8)
         """
         self.watch_dirs = [Path(d) for d in watch_dirs]
         self.graph_path = Path(graph_path)
         self.processed_dir = Path(processed_dir)
         self.poll_interval = poll_interval
+        self.save_delay = save_delay
+        
+        # 연속된 변경을 한 번의 저장으로 묶기 위한 지연 저장 타이머
+        self._save_timer: threading.Timer | None = None
+        self._save_lock = threading.Lock()
+        
+        # 여러 파일이 한꺼번에 바뀔 때 파싱을 병렬로 처리 (그래프 변경은 GraphUpdater 락으로 직렬화)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._parse_pool = self._create_parse_pool()
+        self._stats_lock = threading.Lock()
+        
+        # 같은 경로의 이벤트는 순서대로 하나씩 처리 (처리 중 들어온 이벤트는 최신 것만 유지)
+        self._pending_events: dict[str, FileChangeEvent] = {}
+        self._active_paths: set[str] = set()
+        self._pending_lock = threading.Lock()
         
         # 컴포넌트 초기화
-        self.file_watcher = FileWatcher(watch_dirs, poll_interval)
+        self.file_watcher = FileWatcher(watch_dirs, poll_interval, use_native=use_native)
         self.graph_updater = GraphUpdater(graph_path, processed_dir)
         
         # 파일 변경 이벤트 콜백 등록
@@ -51,29 +75,81 @@ class RealtimeMonitor:
         
         logger.info("RealtimeMonitor 초기화 완료")
     
+    def _create_parse_pool(self) -> ThreadPoolExecutor:
+        """파일 파싱용 스레드 풀 생성."""
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="realtime-parse")
+    
     def _on_file_changed(self, event: FileChangeEvent):
-        """파일 변경 이벤트 핸들러."""
+        """파일 변경 이벤트 핸들러 (처리는 파싱 스레드 풀에서 수행).
+        
+        경로별로 한 번에 하나의 작업만 실행해, 늦게 끝난 이전 파싱 결과가
+        최신 결과를 덮어쓰지 않도록 합니다.
+        """
+        key = os.fspath(event.path)
+        with self._pending_lock:
+            self._pending_events[key] = event
+            if key in self._active_paths:
+                return  # 실행 중인 작업이 끝난 뒤 최신 이벤트를 이어서 처리
+            self._active_paths.add(key)
+        self._parse_pool.submit(self._drain_path, key)
+    
+    def _drain_path(self, key: str):
+        """한 경로의 대기 중인 최신 이벤트를 더 이상 없을 때까지 처리."""
+        while True:
+            with self._pending_lock:
+                event = self._pending_events.pop(key, None)
+                if event is None:
+                    self._active_paths.discard(key)
+                    return
+            self._process_change(event)
+    
+    def _process_change(self, event: FileChangeEvent):
+        """파일 변경 처리 및 통계 업데이트."""
         try:
-            # 그래프 업데이트
-            self.graph_updater.handle_file_change(event)
+            # 그래프 업데이트 (저장은 지연 처리)
+            self.graph_updater.handle_file_change(event, save=False)
+            self._schedule_save()
             
             # 통계 업데이트
-            self.stats['files_processed'] += 1
-            if event.file_type == 'ifc':
-                self.stats['ifc_files'] += 1
-            elif event.file_type == 'bcf':
-                self.stats['bcf_files'] += 1
-            self.stats['last_update'] = datetime.now().isoformat()
+            with self._stats_lock:
+                self.stats['files_processed'] += 1
+                if event.file_type == 'ifc':
+                    self.stats['ifc_files'] += 1
+                elif event.file_type == 'bcf':
+                    self.stats['bcf_files'] += 1
+                self.stats['last_update'] = datetime.now().isoformat()
+                files_processed = self.stats['files_processed']
             
             logger.info(
                 f"파일 처리 완료: {event.path.name} "
-                f"(총 {self.stats['files_processed']}개)"
+                f"(총 {files_processed}개)"
             )
             
         except Exception as e:
-            self.stats['errors'] += 1
+            with self._stats_lock:
+                self.stats['errors'] += 1
             logger.error(f"파일 변경 처리 오류: {e}", exc_info=True)
     
+    def _schedule_save(self):
+        """마지막 이벤트 후 save_delay초 뒤에 한 번 저장하도록 예약."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.save_delay, self._flush_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_save(self):
+        """예약된 그래프 저장 실행."""
+        with self._save_lock:
+            self._save_timer = None
+        try:
+            self.graph_updater.save_graph()
+        except Exception as e:
+            with self._stats_lock:
+                self.stats['errors'] += 1
+            logger.error(f"그래프 저장 오류: {e}", exc_info=True)
+    
     def start(self):
         """실시간 모니터링 시작."""
         logger.info("=" * 60)
@@ -98,7 +174,15 @@ class RealtimeMonitor:
         # 파일 감시 중지
         self.file_watcher.stop()
         
-        # 최종 그래프 저장
+        # 처리 중인 파일 변경을 마친 뒤 저장 (재시작에 대비해 풀은 새로 준비)
+        self._parse_pool.shutdown(wait=True)
+        self._parse_pool = self._create_parse_pool()
+        
+        # 예약된 저장 취소 후 최종 그래프 저장
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
         self.graph_updater.save_graph()
         
         logger.info("=" * 60)
@@ -3,11 +3,27 @@ Visualization tools for the ContextualForget graph system.
 """
 from __future__ import annotations
 
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
 
 import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+import pandas as pd
+
+from ..core import read_graph
+
+_RASTERIZE_NODE_THRESHOLD = 2000
+_LABEL_NODE_THRESHOLD = 200
+_ANNOTATE_EVENT_THRESHOLD = 50
+
+
+def _save_figure(fig: plt.Figure, save_path: str, dpi: int):
+    """Save a figure with a single layout pass (no tight-bbox re-render)."""
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=dpi)
 
 
 class GraphVisualizer:
@@ -17,30 +33,50 @@ class GraphVisualizer:
         self.graph = graph
         self.ifc_nodes = []
         self.bcf_nodes = []
+        self.bcf_event_data = []  # BCF node attribute dicts, e.g. for TimelineVisualizer
+        self._labels = {}
+        self._pos = None  # cached spring layout, shared across plot calls
         self._categorize_nodes()
     
     def _categorize_nodes(self):
-        """Categorize nodes into IFC and BCF types."""
+        """Categorize nodes into IFC and BCF types and build labels in one pass."""
         for node, data in self.graph.nodes(data=True):
             if node[0] == "IFC":
                 self.ifc_nodes.append((node, data))
-            elif node[0] == "BCF":
+                self._labels[node] = f"IFC\n{node[1][:8]}..."
+                continue
+            if node[0] == "BCF":
                 self.bcf_nodes.append((node, data))
+                self.bcf_event_data.append(data)
+            self._labels[node] = f"BCF\n{node[1][:8]}..."
+    
+    def _layout(self) -> dict:
+        """Return the spring layout, computing it on first use."""
+        if self._pos is None:
+            # networkx>=3.5 switches to the L-BFGS energy method on large graphs (method="auto")
+            self._pos = nx.spring_layout(self.graph, k=3, iterations=50, seed=0)
+        return self._pos
     
     def plot_graph(self, 
                    figsize: tuple[int, int] = (12, 8),
                    node_size: int = 1000,
                    font_size: int = 8,
-                   save_path: str | None = None) -> plt.Figure:
-        """Plot the entire graph."""
+                   save_path: str | None = None,
+                   dpi: int = 150,
+                   show_labels: bool | None = None) -> plt.Figure:
+        """Plot the entire graph.
+        
+        Node labels are drawn by default only for graphs of up to 200 nodes;
+        beyond that they are unreadable. Pass ``show_labels`` to override.
+        """
         fig, ax = plt.subplots(figsize=figsize)
         
         # Use spring layout for better visualization
-        pos = nx.spring_layout(self.graph, k=3, iterations=50)
+        pos = self._layout()
         
         # Draw IFC nodes (blue)
         ifc_pos = {node: pos[node] for node, _ in self.ifc_nodes}
-        nx.draw_networkx_nodes(self.graph, ifc_pos, 
+        ifc_collection = nx.draw_networkx_nodes(self.graph, ifc_pos, 
                               nodelist=[node for node, _ in self.ifc_nodes],
                               node_color='lightblue', 
                               node_size=node_size,
@@ -48,12 +84,18 @@ class GraphVisualizer:
         
         # Draw BCF nodes (orange)
         bcf_pos = {node: pos[node] for node, _ in self.bcf_nodes}
-        nx.draw_networkx_nodes(self.graph, bcf_pos,
+        bcf_collection = nx.draw_networkx_nodes(self.graph, bcf_pos,
                               nodelist=[node for node, _ in self.bcf_nodes],
                               node_color='orange',
                               node_size=node_size,
                               alpha=0.8)
         
+        # Rasterize node markers on large graphs to keep vector output small
+        if self.graph.number_of_nodes() > _RASTERIZE_NODE_THRESHOLD:
+            for collection in (ifc_collection, bcf_collection):
+                if collection is not None:
+                    collection.set_rasterized(True)
+        
         # Draw edges
         nx.draw_networkx_edges(self.graph, pos, 
                               edge_color='gray',
@@ -62,14 +104,10 @@ class GraphVisualizer:
                               alpha=0.6)
         
         # Draw labels
-        labels = {}
-        for node, _data in self.graph.nodes(data=True):
-            if node[0] == "IFC":
-                labels[node] = f"IFC\n{node[1][:8]}..."
-            else:
-                labels[node] = f"BCF\n{node[1][:8]}..."
-        
-        nx.draw_networkx_labels(self.graph, pos, labels, font_size=font_size)
+        if show_labels is None:
+            show_labels = len(self.graph) <= _LABEL_NODE_THRESHOLD
+        if show_labels:
+            nx.draw_networkx_labels(self.graph, pos, self._labels, font_size=font_size)
         
         # Add legend
         ifc_patch = mpatches.Patch(color='lightblue', label='IFC Entities')
@@ -80,14 +118,15 @@ class GraphVisualizer:
         ax.axis('off')
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            _save_figure(fig, save_path, dpi)
         
         return fig
     
     def plot_subgraph(self, 
                       target_guid: str,
                       figsize: tuple[int, int] = (10, 6),
-                      save_path: str | None = None) -> plt.Figure:
+                      save_path: str | None = None,
+                      dpi: int = 150) -> plt.Figure:
         """Plot subgraph around a specific IFC GUID."""
         # Find all nodes connected to the target GUID
         target_node = ("IFC", target_guid)
@@ -95,23 +134,30 @@ class GraphVisualizer:
             raise ValueError(f"GUID {target_guid} not found in graph")
         
         # Get all connected nodes
-        connected_nodes = {target_node}
-        for neighbor in self.graph.neighbors(target_node):
-            connected_nodes.add(neighbor)
-        for predecessor in self.graph.predecessors(target_node):
-            connected_nodes.add(predecessor)
+        connected_nodes = {target_node,
+                           *self.graph.successors(target_node),
+                           *self.graph.predecessors(target_node)}
         
-        # Create subgraph
-        subgraph = self.graph.subgraph(connected_nodes)
+        # Create subgraph (filtered view, no copy; show_nodes lets node
+        # iteration walk the small node set instead of the whole graph)
+        subgraph = nx.subgraph_view(self.graph,
+                                    filter_node=nx.filters.show_nodes(connected_nodes))
         
         fig, ax = plt.subplots(figsize=figsize)
         
         # Use circular layout for subgraph
         pos = nx.circular_layout(subgraph)
         
+        # Split nodes by type and collect labels in one pass
+        ifc_nodes, bcf_nodes, labels = [], [], {}
+        for node in subgraph:
+            if node[0] == "IFC":
+                ifc_nodes.append(node)
+            elif node[0] == "BCF":
+                bcf_nodes.append(node)
+            labels[node] = self._labels[node]
+        
         # Draw nodes
-        ifc_nodes = [node for node in subgraph.nodes() if node[0] == "IFC"]
-        bcf_nodes = [node for node in subgraph.nodes() if node[0] == "BCF"]
         
         nx.draw_networkx_nodes(subgraph, pos,
                               nodelist=ifc_nodes,
@@ -140,13 +186,6 @@ class GraphVisualizer:
                               alpha=0.6)
         
         # Draw labels
-        labels = {}
-        for node in subgraph.nodes():
-            if node[0] == "IFC":
-                labels[node] = f"IFC\n{node[1][:8]}..."
-            else:
-                labels[node] = f"BCF\n{node[1][:8]}..."
-        
         nx.draw_networkx_labels(subgraph, pos, labels, font_size=10)
         
         # Add legend
@@ -159,7 +198,7 @@ class GraphVisualizer:
         ax.axis('off')
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            _save_figure(fig, save_path, dpi)
         
         return fig
 
@@ -169,43 +208,57 @@ class TimelineVisualizer:
     
     def __init__(self, events: list[dict]):
         self.events = events
+        self._created = None
+    
+    def _parse_created(self) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Parse every event's ``created`` timestamp once, vectorized.
+        
+        Returns UTC timestamps (naive values are taken as UTC) and a mask of
+        events whose timestamp parsed.
+        """
+        if self._created is None:
+            created = pd.to_datetime([event.get("created", "") for event in self.events],
+                                     utc=True, errors="coerce", format="ISO8601")
+            self._created = (created, ~created.isna())
+        return self._created
     
     def plot_timeline(self, 
                       figsize: tuple[int, int] = (12, 6),
-                      save_path: str | None = None) -> plt.Figure:
-        """Plot event timeline."""
+                      save_path: str | None = None,
+                      dpi: int = 150,
+                      show_labels: bool | None = None) -> plt.Figure:
+        """Plot event timeline.
+        
+        Event titles are annotated by default only for up to 50 events.
+        Pass ``show_labels`` to override.
+        """
         fig, ax = plt.subplots(figsize=figsize)
         
-        # Parse dates and sort events
-        event_dates = []
-        event_labels = []
-        
-        for event in self.events:
-            try:
-                date_str = event.get("created", "")
-                if date_str:
-                    date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                    event_dates.append(date)
-                    event_labels.append(event.get("title", "Unknown")[:30])
-            except Exception:
-                continue
+        # Parse dates (naive UTC datetime64 so matplotlib converts the whole array at once)
+        created, valid = self._parse_created()
+        event_dates = created[valid].tz_localize(None).to_numpy()
         
-        if not event_dates:
+        if not len(event_dates):
             ax.text(0.5, 0.5, "No valid dates found", 
                    ha='center', va='center', transform=ax.transAxes)
             return fig
         
         # Create timeline
-        y_positions = range(len(event_dates))
+        y_positions = np.arange(len(event_dates))
         
         ax.scatter(event_dates, y_positions, 
                   c='blue', alpha=0.7, s=100)
         
         # Add labels
-        for i, (date, label) in enumerate(zip(event_dates, event_labels, strict=False)):
-            ax.annotate(label, (date, i), 
-                       xytext=(5, 0), textcoords='offset points',
-                       fontsize=8, alpha=0.8)
+        if show_labels is None:
+            show_labels = len(event_dates) <= _ANNOTATE_EVENT_THRESHOLD
+        if show_labels:
+            event_labels = [str(event.get("title", "Unknown"))[:30]
+                            for event, ok in zip(self.events, valid) if ok]
+            for i, (date, label) in enumerate(zip(event_dates, event_labels, strict=False)):
+                ax.annotate(label, (date, i), 
+                           xytext=(5, 0), textcoords='offset points',
+                           fontsize=8, alpha=0.8)
         
         ax.set_xlabel('Date')
         ax.set_ylabel('Event Index')
@@ -216,42 +269,29 @@ class TimelineVisualizer:
         plt.xticks(rotation=45)
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            _save_figure(fig, save_path, dpi)
         
         return fig
     
     def plot_forgetting_curve(self, 
                              ttl_days: int = 365,
                              figsize: tuple[int, int] = (10, 6),
-                             save_path: str | None = None) -> plt.Figure:
+                             save_path: str | None = None,
+                             dpi: int = 150) -> plt.Figure:
         """Plot forgetting curve based on TTL."""
         fig, ax = plt.subplots(figsize=figsize)
         
-        # Calculate retention over time
-        days = list(range(0, ttl_days + 1, 30))
-        retention_rates = []
-        
-        for day in days:
-            retained = 0
-            total = 0
-            
-            for event in self.events:
-                try:
-                    date_str = event.get("created", "")
-                    if date_str:
-                        event_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        age_days = (datetime.now() - event_date).days
-                        total += 1
-                        
-                        if age_days <= day:
-                            retained += 1
-                except Exception:
-                    continue
-            
-            if total > 0:
-                retention_rates.append(retained / total)
-            else:
-                retention_rates.append(0.0)
+        # Event ages in whole days
+        created, valid = self._parse_created()
+        ages = (pd.Timestamp.now(tz="UTC") - created[valid]).days.to_numpy()
+        
+        # Calculate retention over time: share of events with age <= day
+        days = np.arange(0, ttl_days + 1, 30)
+        if ages.size:
+            sorted_ages = np.sort(ages)
+            retention_rates = np.searchsorted(sorted_ages, days, side='right') / sorted_ages.size
+        else:
+            retention_rates = np.zeros(days.size)
         
         ax.plot(days, retention_rates, 'b-', linewidth=2, marker='o')
         ax.set_xlabel('Days')
@@ -261,57 +301,74 @@ class TimelineVisualizer:
         ax.set_ylim(0, 1.1)
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            _save_figure(fig, save_path, dpi)
         
         return fig
 
 
+_REPORT_SAMPLE_GUID = "1kTvXnbbzCWw8lcMd1dR4o"
+
+
+def _init_report_worker():
+    """Use the non-interactive backend in report worker processes."""
+    plt.switch_backend("Agg")
+
+
+def _render_report_figure(visualizer: GraphVisualizer, kind: str, save_path: str) -> bool:
+    """Render one report figure; returns False if it could not be produced."""
+    if kind == "full_graph":
+        fig = visualizer.plot_graph(save_path=save_path)
+    elif kind == "subgraph":
+        try:
+            fig = visualizer.plot_subgraph(_REPORT_SAMPLE_GUID, save_path=save_path)
+        except ValueError:
+            return False
+    elif kind == "timeline":
+        fig = TimelineVisualizer(visualizer.bcf_event_data).plot_timeline(save_path=save_path)
+    else:
+        fig = TimelineVisualizer(visualizer.bcf_event_data).plot_forgetting_curve(save_path=save_path)
+    
+    plt.close(fig)
+    return True
+
+
+def _render_report_figure_from_path(graph_path: str, kind: str, save_path: str) -> bool:
+    """Worker entry point: load the graph in the worker process, then render."""
+    return _render_report_figure(GraphVisualizer(read_graph(graph_path)), kind, save_path)
+
+
 def create_visualization_report(graph_path: str, 
-                               output_dir: str = "visualizations"):
-    """Create a comprehensive visualization report."""
-    import os
-    import pickle
+                               output_dir: str = "visualizations",
+                               max_workers: int = 1):
+    """Create a comprehensive visualization report.
     
+    ``graph_path`` may be node-link JSON (``.json``) or a pickled graph.
+    Figures are rendered in-process by default; ``max_workers > 1`` opts in
+    to a process pool where each worker loads the graph from ``graph_path``.
+    """
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Load graph
-    with Path(graph_path).open('rb') as f:
-        graph = pickle.load(f)
+    # Load graph and create graph visualizer
+    visualizer = GraphVisualizer(read_graph(graph_path))
     
-    # Create graph visualizer
-    visualizer = GraphVisualizer(graph)
+    jobs = [("full_graph", "full_graph.png"), ("subgraph", "subgraph_sample.png")]
+    if visualizer.bcf_event_data:
+        jobs += [("timeline", "timeline.png"), ("forgetting_curve", "forgetting_curve.png")]
+    kinds = [kind for kind, _ in jobs]
+    paths = [f"{output_dir}/{filename}" for _, filename in jobs]
     
-    # Plot full graph
-    fig1 = visualizer.plot_graph(save_path=f"{output_dir}/full_graph.png")
-    plt.close(fig1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                 initializer=_init_report_worker) as executor:
+            rendered = list(executor.map(_render_report_figure_from_path,
+                                         repeat(graph_path), kinds, paths))
+    else:
+        rendered = [_render_report_figure(visualizer, kind, path)
+                    for kind, path in zip(kinds, paths)]
     
-    # Plot subgraph for sample GUID
-    try:
-        fig2 = visualizer.plot_subgraph(
-            "1kTvXnbbzCWw8lcMd1dR4o",
-            save_path=f"{output_dir}/subgraph_sample.png"
-        )
-        plt.close(fig2)
-    except ValueError:
+    if not rendered[kinds.index("subgraph")]:
         print("Sample GUID not found in graph")
     
-    # Create timeline visualizer
-    bcf_events = []
-    for node, data in graph.nodes(data=True):
-        if node[0] == "BCF":
-            bcf_events.append(data)
-    
-    if bcf_events:
-        timeline_viz = TimelineVisualizer(bcf_events)
-        
-        # Plot timeline
-        fig3 = timeline_viz.plot_timeline(save_path=f"{output_dir}/timeline.png")
-        plt.close(fig3)
-        
-        # Plot forgetting curve
-        fig4 = timeline_viz.plot_forgetting_curve(save_path=f"{output_dir}/forgetting_curve.png")
-        plt.close(fig4)
-    
     print(f"Visualization report created in {output_dir}/")
     return output_dir
@@ -0,0 +1,78 @@
+"""
+공용 pytest 픽스처
+실제 처리 데이터(data/processed)를 사용하는 통합 테스트가 세션당 한 번만 읽고 구축하도록 공유
+"""
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from contextualforget.data.build_graph import build_graph_from_files
+
+PROCESSED_DIR = Path('data/processed')
+
+
+def _file_key(path) -> tuple[str, int, int]:
+    """파일 캐시 키: (절대 경로, mtime_ns, 크기) - 파일이 바뀌면 키도 바뀜"""
+    path = Path(path).resolve()
+    st = path.stat()
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=8)
+def _cached_build(ifc_keys, bcf_keys, links_key):
+    """입력 파일 키 조합당 그래프를 한 번만 구축"""
+    return build_graph_from_files(
+        [key[0] for key in ifc_keys],
+        [key[0] for key in bcf_keys],
+        links_key[0]
+    )
+
+
+@pytest.fixture(scope="session")
+def build_graph_cached():
+    """build_graph_from_files의 세션 공용 메모이즈 버전 (반환 그래프는 공유되므로 변경 금지)"""
+    def _build(ifc_files, bcf_files, links_file):
+        return _cached_build(
+            tuple(_file_key(f) for f in ifc_files),
+            tuple(_file_key(f) for f in bcf_files),
+            _file_key(links_file)
+        )
+    return _build
+
+
+@pytest.fixture(scope="session")
+def real_data_files():
+    """실제 IFC/BCF 파일 목록 (세션당 한 번 검색, 이름순 정렬)"""
+    if not PROCESSED_DIR.exists():
+        pytest.skip("data/processed 디렉토리가 없습니다")
+
+    ifc_files = sorted(PROCESSED_DIR.glob('*_ifc.jsonl'))
+    bcf_files = sorted(PROCESSED_DIR.glob('*_bcf.jsonl'))
+
+    if not ifc_files or not bcf_files:
+        pytest.skip("IFC 또는 BCF 파일이 없습니다")
+
+    return {
+        'ifc_files': ifc_files,
+        'bcf_files': bcf_files,
+        'links_file': PROCESSED_DIR / 'sample_links.jsonl'
+    }
+
+
+@pytest.fixture(scope="session")
+def real_graph(real_data_files, build_graph_cached):
+    """실제 파일 처음 5개씩으로 구축한 그래프 (세션당 한 번, 테스트에서 변경 금지)"""
+    links_file = real_data_files['links_file']
+    if not links_file.exists():
+        pytest.skip("sample_links.jsonl 파일이 없습니다")
+
+    return build_graph_cached(
+        real_data_files['ifc_files'][:5],
+        real_data_files['bcf_files'][:5],
+        links_file
+    )
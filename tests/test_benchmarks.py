@@ -0,0 +1,55 @@
+"""
+링크 매칭 및 IFC 추출 함수 마이크로벤치마크 (pytest-benchmark)
+GUID 추출, 키워드 매칭, IFC 엔티티 추출의 성능 회귀 감지용
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from contextualforget.core import extract_ifc_entities
+from contextualforget.data.link_ifc_bcf import extract_guid_from_text, semantic_match_keyword
+
+
+class TestMatcherBenchmarks:
+    """링크 매칭 함수 벤치마크"""
+
+    @pytest.fixture(scope="module")
+    def sample_ifc_item(self):
+        """벤치마크용 IFC 엔티티"""
+        return {'guid': 'guid001', 'name': '외벽 A', 'type': 'IfcWall'}
+
+    def test_bench_extract_guid(self, benchmark):
+        """벤치마크 1: 여러 GUID가 포함된 긴 텍스트에서 GUID 추출"""
+        text = "GUID 1kTvXnbbzCWw8lcMd1dR4o와 23sFQGRy90RxVbRHD9iSE2 확인 " * 100
+        guids = benchmark(extract_guid_from_text, text)
+        assert len(guids) == 2
+
+    def test_bench_keyword_match(self, benchmark, sample_ifc_item):
+        """벤치마크 2: 키워드 매칭"""
+        score = benchmark(semantic_match_keyword, "벽체 문 창문 기둥 바닥", sample_ifc_item)
+        assert 0.0 <= score <= 1.0
+
+
+class TestIFCExtractBenchmarks:
+    """IFC 엔티티 추출 벤치마크"""
+
+    @pytest.fixture(scope="module")
+    def large_ifc_text(self):
+        """벤치마크용 대용량 IFC 텍스트 (엔티티 3개 x 10000회 반복, 약 2.5MB)"""
+        ifc_text = (
+            "#100= IFCPROJECT('0xScRe4drECQ4DMSqUjd6d',$,'Sample',$,$,$,$,$,$);\n"
+            "#500= IFCBUILDING('2FCZDorxHDT8NI01kdXi8P',$,'Test Building',$,$,$,$,$,.ELEMENT.,$,$,$);\n"
+            "#1000= IFCBUILDINGELEMENTPROXY('1kTvXnbbzCWw8lcMd1dR4o',$,'P-1','sample',$,$,$,$,$);\n"
+        )
+        return ifc_text * 10000
+
+    def test_bench_extract_ifc_entities(self, benchmark, large_ifc_text):
+        """벤치마크 3: 대용량 IFC 텍스트에서 엔티티 추출 (GUID 중복 제거 포함)"""
+        entities = benchmark(extract_ifc_entities, large_ifc_text)
+        assert len(entities) == 3
@@ -0,0 +1,254 @@
+"""Tests for the contextual forgetting query engine."""
+from datetime import UTC, datetime, timedelta
+
+import networkx as nx
+import pytest
+
+from contextualforget.query.contextual_forget_engine import ContextualForgetEngine
+
+
+class TestContextualForgetEngine:
+    @pytest.fixture
+    def sample_graph(self):
+        """Create a small IFC/BCF graph for testing."""
+        G = nx.DiGraph()
+        created = (datetime.now(UTC) - timedelta(days=10)).isoformat()
+
+        for i in range(5):
+            G.add_node(("IFC", f"guid{i}"), type="WALL", name=f"Wall {i}")
+            G.add_node(("BCF", f"topic{i}"),
+                      title=f"Clearance issue {i}",
+                      description=f"HVAC duct clash on level {i}",
+                      created=created,
+                      author=f"engineer_{i % 2}")
+            G.add_edge(("BCF", f"topic{i}"), ("IFC", f"guid{i}"),
+                      type="refersTo", confidence=0.9)
+
+        G.add_node(("BCF", "11111111-2222-3333-4444-555555555555"),
+                  title="Door width", description="door too narrow",
+                  created=created, author="architect_a")
+        return G
+
+    def test_contextual_query_keywords(self, sample_graph):
+        """Keyword queries return the standard response format."""
+        engine = ContextualForgetEngine(sample_graph)
+        response = engine.contextual_query("clearance")
+
+        assert response["source"] == "ContextualForget"
+        assert response["result_count"] == 5
+        assert set(response["entities"]) == {f"topic{i}" for i in range(5)}
+        assert response["details"]["query_type"] == "general"
+
+    def test_contextual_query_guid(self, sample_graph):
+        """GUID queries match BCF topics directly."""
+        engine = ContextualForgetEngine(sample_graph)
+        response = engine.contextual_query("find 11111111-2222-3333-4444-555555555555")
+
+        assert response["details"]["query_type"] == "guid"
+        assert response["entities"] == ["11111111-2222-3333-4444-555555555555"]
+
+    def test_batch_contextual_query_matches_serial(self, sample_graph):
+        """Batch queries produce the same results as serial calls, in order."""
+        queries = [
+            "clearance",
+            "engineer_0 issues",
+            "find 11111111-2222-3333-4444-555555555555",
+            "HVAC duct",
+            "nothing matches this",
+        ]
+
+        serial_engine = ContextualForgetEngine(sample_graph)
+        serial = [serial_engine.contextual_query(q) for q in queries]
+
+        batch_engine = ContextualForgetEngine(sample_graph, max_workers=4)
+        batch = batch_engine.batch_contextual_query(queries)
+        batch_engine.close()
+
+        assert len(batch) == len(queries)
+        for s, b in zip(serial, batch, strict=True):
+            assert b["details"]["query"] == s["details"]["query"]
+            assert b["details"]["query_type"] == s["details"]["query_type"]
+            assert b["entities"] == s["entities"]
+            assert b["confidence"] == pytest.approx(s["confidence"])
+
+        assert (batch_engine.performance_metrics["total_queries"]
+                == serial_engine.performance_metrics["total_queries"])
+
+    def test_batch_contextual_query_empty(self, sample_graph):
+        """An empty batch returns an empty list."""
+        engine = ContextualForgetEngine(sample_graph)
+        assert engine.batch_contextual_query([]) == []
+
+    def test_performance_metrics_averages(self, sample_graph):
+        """Averages are derived from accumulated sums."""
+        engine = ContextualForgetEngine(sample_graph)
+        engine._update_performance_metrics(0.2, 2, 4)
+        engine._update_performance_metrics(0.4, 0, 3)
+
+        metrics = engine.performance_metrics
+        assert metrics["total_queries"] == 2
+        assert metrics["successful_queries"] == 1
+        assert metrics["average_relevance_score"] == pytest.approx(0.25)
+        assert metrics["average_response_time"] == pytest.approx(0.3)
+
+    def test_contextual_query_counts_once(self, sample_graph):
+        """Each contextual query is recorded exactly once in the metrics."""
+        engine = ContextualForgetEngine(sample_graph)
+        engine.contextual_query("clearance")
+        engine.contextual_query("engineer_1 issues")
+
+        assert engine.performance_metrics["total_queries"] == 2
+        assert engine.performance_metrics["successful_queries"] == 2
+
+    def test_query_features(self, sample_graph):
+        """Query features are computed once and drive classification."""
+        engine = ContextualForgetEngine(sample_graph)
+
+        features = engine._build_features("find 11111111-2222-3333-4444-555555555555")
+        assert features.guid == "11111111-2222-3333-4444-555555555555"
+        assert engine._classify(features) == "guid"
+
+        features = engine._build_features("Issues by engineer_1")
+        assert features.tokens == ("Issues", "by", "engineer_1")
+        assert features.author == "engineer_1"
+        assert engine._classify(features) == "author"
+
+        assert engine._classify(engine._build_features("recent issues")) == "temporal"
+        assert engine._classify(engine._build_features("clearance")) == "general"
+
+    def test_query_history_is_bounded(self, sample_graph):
+        """Query history keeps only the most recent entries."""
+        engine = ContextualForgetEngine(sample_graph, query_history_size=3)
+        for i in range(5):
+            engine.contextual_query(f"clearance {i}")
+
+        assert len(engine.query_history) == 3
+        recent = engine.recent_queries(2)
+        assert [r["query"] for r in recent] == ["clearance 3", "clearance 4"]
+        assert len(engine.recent_queries(10)) == 3
+
+    def test_query_cache_without_forgetting(self, sample_graph):
+        """Non-forgetting queries are served from cache until the graph changes."""
+        engine = ContextualForgetEngine(sample_graph)
+
+        first = engine.contextual_query("clearance", apply_forgetting=False)
+        second = engine.contextual_query("clearance", apply_forgetting=False)
+        assert second["entities"] == first["entities"]
+        assert second["details"]["results"] == first["details"]["results"]
+        assert engine.performance_metrics["total_queries"] == 2
+
+        # Forgetting queries are never cached
+        engine.contextual_query("clearance")
+        assert len(engine._query_cache) == 1
+
+        # Graph mutation invalidates the cache
+        sample_graph.add_node(("BCF", "topic_new"), title="Clearance again",
+                              created=first["details"]["results"][0]["created"],
+                              author="engineer_0")
+        third = engine.contextual_query("clearance", apply_forgetting=False)
+        assert "topic_new" in third["entities"]
+
+        engine.invalidate_query_cache()
+        assert len(engine._query_cache) == 0
+
+    def test_ensure_doc_ids_in_place(self):
+        """doc_id is backfilled on the same dicts without copying."""
+        results = [{"topic_id": "t1"}, {"guid": "g1"}, {"doc_id": "d1", "topic_id": "t2"}]
+        originals = list(results)
+
+        assert ContextualForgetEngine._ensure_doc_ids(results) is results
+        assert [d["doc_id"] for d in results] == ["t1", "g1", "d1"]
+        assert all(a is b for a, b in zip(results, originals, strict=True))
+
+    def test_adaptive_weights_cached_per_type(self, sample_graph):
+        """Adaptive weights are computed once per query type from the base weights."""
+        engine = ContextualForgetEngine(sample_graph)
+        base = engine._adaptive_weights("general")
+
+        engine._apply_adaptive_weights("temporal")
+        assert engine.forgetting_manager.recency_weight == pytest.approx(0.6)
+
+        # General queries fall back to the base weights, not the last applied ones
+        engine._apply_adaptive_weights("general")
+        assert engine.forgetting_manager.recency_weight == pytest.approx(base[1])
+        assert set(engine._weights_cache) == {"general", "temporal"}
+
+        engine.adapt_forgetting_policy(0.9)
+        assert engine._weights_cache == {}
+
+    def test_query_cache_key_and_ttl(self, sample_graph):
+        """Cache keys ignore surrounding whitespace and entries expire after the TTL."""
+        engine = ContextualForgetEngine(sample_graph, query_cache_ttl=60.0)
+
+        first = engine.contextual_query("clearance", apply_forgetting=False)
+        cached_at = engine._query_cache[("auto", "clearance")][0]
+        second = engine.contextual_query("  clearance ", apply_forgetting=False)
+        assert second["details"]["results"] == first["details"]["results"]
+        assert second["details"]["query"] == "  clearance "
+        assert list(engine._query_cache) == [("auto", "clearance")]
+        assert engine._query_cache[("auto", "clearance")][0] == cached_at
+
+        # An expired entry is recomputed and stored again
+        engine.query_cache_ttl = 0.0
+        engine.contextual_query("clearance", apply_forgetting=False)
+        assert engine._query_cache[("auto", "clearance")][0] > cached_at
+
+    def test_query_cache_hits_do_not_share_state(self, sample_graph):
+        """Mutating one response does not change what later cache hits return."""
+        engine = ContextualForgetEngine(sample_graph)
+
+        first = engine.contextual_query("clearance", apply_forgetting=False)
+        expected_entities = list(first["entities"])
+        expected_results = [dict(doc) for doc in first["details"]["results"]]
+
+        # Mutate the response that was just stored
+        first["entities"].append("bogus")
+        first["details"]["results"][0]["title"] = "edited"
+        first["details"]["contextual_scores"].clear()
+
+        second = engine.contextual_query("clearance", apply_forgetting=False)
+        assert second["entities"] == expected_entities
+        assert second["details"]["results"] == expected_results
+
+        # Mutate a cache hit
+        second["details"]["results"].reverse()
+        second["details"]["results"][0]["title"] = "edited again"
+        second["entities"].clear()
+
+        third = engine.contextual_query("clearance", apply_forgetting=False)
+        assert third["entities"] == expected_entities
+        assert third["details"]["results"] == expected_results
+        assert len(third["details"]["contextual_scores"]) == len(expected_results)
+
+    def test_empty_results_skip_context_update(self, sample_graph):
+        """Queries without results do not touch the forgetting context."""
+        engine = ContextualForgetEngine(sample_graph)
+
+        assert engine.find_by_keywords_with_forgetting(["nothing", "matches"]) == []
+        assert len(engine.forgetting_manager.context_history) == 0
+        assert engine.performance_metrics["total_queries"] == 1
+
+        engine.find_by_keywords_with_forgetting(["clearance"])
+        assert len(engine.forgetting_manager.context_history) == 1
+
+    def test_reset_forgetting_state_reuses_objects(self, sample_graph):
+        """Reset clears state in place and restores configured weights."""
+        from contextualforget.core.contextual_forgetting import create_contextual_forgetting_manager
+
+        manager = create_contextual_forgetting_manager({"usage_weight": 0.5, "recency_weight": 0.25,
+                                                        "relevance_weight": 0.25})
+        engine = ContextualForgetEngine(sample_graph, forgetting_manager=manager)
+        policy = engine.adaptive_policy
+        engine.contextual_query("recent clearance issues")
+        engine.adapt_forgetting_policy(0.2)
+
+        engine.reset_forgetting_state()
+
+        assert engine.forgetting_manager is manager
+        assert engine.adaptive_policy is policy
+        assert len(manager.context_history) == 0
+        assert len(manager.document_stats) == 0
+        assert len(policy.performance_history) == 0
+        assert manager.usage_weight == 0.5
+        assert engine.performance_metrics["total_queries"] == 0
+        assert len(engine.query_history) == 0
@@ -3,17 +3,41 @@
 모든 엔진(BM25, Vector, ContextualForget, Hybrid)이 표준 응답 형식을 따르는지 확인
 """
 
-import pytest
+import re
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
+# 테스트에서 확인하는 소스 패턴 (파일당 한 번씩만 스캔)
+_PATTERNS = {
+    'return': re.compile(r'return\s+\{[^}]+\}', re.DOTALL),
+    'confidence': re.compile(r'"confidence":\s*([\d.]+)'),
+    'result_count': re.compile(r'"result_count":\s*(\d+)'),
+    'entities_list': re.compile(r'"entities":\s*\['),
+}
+
+
+@lru_cache(maxsize=None)
+def _read(path: str) -> str:
+    """엔진 소스 파일을 모듈 내에서 한 번만 읽기"""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _scan(path: str) -> dict:
+    """파일의 모든 패턴 매치를 한 번에 계산하여 테스트 간 공유"""
+    content = _read(path)
+    return {name: pattern.findall(content) for name, pattern in _PATTERNS.items()}
+
 
 def test_response_format_definition():
     """표준 응답 형식이 base.py에 정의되어 있는지 확인"""
     base_file = Path('src/contextualforget/baselines/base.py')
     assert base_file.exists(), "base.py 파일이 존재하지 않습니다"
     
-    with open(base_file, 'r') as f:
-        content = f.read()
+    content = _read(str(base_file))
     
     # 필수 필드가 docstring에 정의되어 있는지 확인
     required_fields = ['answer', 'confidence', 'result_count', 'entities', 'source']
@@ -24,12 +48,8 @@ def test_response_format_definition():
 def test_bm25_has_entities_field():
     """BM25 엔진의 모든 응답에 entities 필드가 있는지 확인"""
     bm25_file = Path('src/contextualforget/baselines/bm25_engine.py')
-    with open(bm25_file, 'r') as f:
-        content = f.read()
-    
     # return 문 확인
-    import re
-    return_statements = re.findall(r'return\s+\{[^}]+\}', content, re.DOTALL)
+    return_statements = _scan(str(bm25_file))['return']
     
     # 'entities' 필드가 없는 return문 확인
     missing_entities = []
@@ -44,12 +64,8 @@ def test_bm25_has_entities_field():
 def test_vector_has_entities_field():
     """Vector 엔진의 모든 응답에 entities 필드가 있는지 확인"""
     vector_file = Path('src/contextualforget/baselines/vector_engine.py')
-    with open(vector_file, 'r') as f:
-        content = f.read()
-    
     # return 문 확인
-    import re
-    return_statements = re.findall(r'return\s+\{[^}]+\}', content, re.DOTALL)
+    return_statements = _scan(str(vector_file))['return']
     
     # 'entities' 필드가 없는 return문 확인
     missing_entities = []
@@ -69,8 +85,7 @@ def test_all_engines_return_dict():
     ]
     
     for engine_file in engine_files:
-        with open(engine_file, 'r') as f:
-            content = f.read()
+        content = _read(engine_file)
         
         # process_query 메서드가 있는지 확인
         assert 'def process_query' in content, \
@@ -91,8 +106,7 @@ def test_required_fields_in_engines():
     }
     
     for engine_name, engine_file in engine_files.items():
-        with open(engine_file, 'r') as f:
-            content = f.read()
+        content = _read(engine_file)
         
         # 각 필수 필드가 최소 1번 이상 등장하는지 확인
         for field in required_fields:
@@ -108,12 +122,8 @@ def test_entities_field_is_list():
     ]
     
     for engine_file in engine_files:
-        with open(engine_file, 'r') as f:
-            content = f.read()
-        
         # entities 필드가 리스트로 초기화되는지 확인
-        import re
-        entities_assignments = re.findall(r'"entities":\s*\[', content)
+        entities_assignments = _scan(engine_file)['entities_list']
         
         assert len(entities_assignments) > 0, \
             f"{engine_file}에 'entities' 리스트 할당이 없습니다"
@@ -127,12 +137,8 @@ def test_confidence_range():
     ]
     
     for engine_file in engine_files:
-        with open(engine_file, 'r') as f:
-            content = f.read()
-        
         # confidence 값이 있는지 확인
-        import re
-        confidence_values = re.findall(r'"confidence":\s*([\d.]+)', content)
+        confidence_values = _scan(engine_file)['confidence']
         
         assert len(confidence_values) > 0, \
             f"{engine_file}에 confidence 값이 없습니다"
@@ -152,12 +158,8 @@ def test_result_count_non_negative():
     ]
     
     for engine_file in engine_files:
-        with open(engine_file, 'r') as f:
-            content = f.read()
-        
         # result_count 값이 있는지 확인
-        import re
-        result_counts = re.findall(r'"result_count":\s*(\d+)', content)
+        result_counts = _scan(engine_file)['result_count']
         
         assert len(result_counts) > 0, \
             f"{engine_file}에 result_count 값이 없습니다"
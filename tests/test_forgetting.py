@@ -1,18 +1,41 @@
 """Tests for forgetting mechanisms."""
 import pytest
 from datetime import datetime, timezone, timedelta
+from contextualforget.core import (
+    CompositeForgettingPolicy,
+    ContradictionPolicy,
+    ForgettingManager,
+    ImportanceBasedPolicy,
+    TTLPolicy,
+    WeightedDecayPolicy,
+    calculate_event_importance,
+    create_default_forgetting_policy,
+    expired,
+    expired_batch,
+    score,
+    score_batch,
+)
 from contextualforget.core.contextual_forgetting import ContextualForgettingManager
 
+RECENT_AGE = timedelta(days=30)
+OLD_AGE = timedelta(days=400)
+
+
+@pytest.fixture(scope="module")
+def now_utc():
+    """Capture the current UTC time once for the whole module."""
+    return datetime.now(timezone.utc)
+
 
 class TestForgetting:
-    def test_expired_function(self):
+    def test_expired_function(self, now_utc):
         """Test TTL expiration logic."""
         # Recent date (should not expire)
-        recent_date = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        recent_date = (now_utc - RECENT_AGE).isoformat()
         assert not expired(recent_date, 365)
         
         # Old date (should expire)
-        old_date = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+        old_date = (now_utc - OLD_AGE).isoformat()
         assert expired(old_date, 365)
         
         # TTL of 0 should never expire
@@ -21,6 +44,44 @@ class TestForgetting:
         # Invalid date should expire
         assert expired("invalid-date", 365)
     
+    def test_expired_batch_matches_ttl_policy(self, now_utc):
+        """Test vectorized expiration agrees with the scalar TTL policy."""
+        created = [
+            (now_utc - RECENT_AGE).isoformat(),
+            (now_utc - OLD_AGE).isoformat(),
+            (now_utc - timedelta(days=100)).isoformat().replace("+00:00", "Z"),
+            "invalid-date",
+            "",
+            "2024-01-01T00:00:00",  # no offset
+        ]
+        policy = TTLPolicy(ttl_days=365)
+
+        mask = expired_batch(created, 365)
+        assert mask.tolist() == [policy.should_forget({"created": c}, {}) for c in created]
+        assert mask.tolist() == [False, True, False, True, True, True]
+
+        # TTL of 0 should never expire
+        assert not expired_batch(created, 0).any()
+        assert expired_batch([], 365).size == 0
+    
+    def test_expired_batch_non_string_and_unusual_offsets(self, now_utc):
+        """Test vectorized expiration matches the scalar check for any created value."""
+        recent = now_utc - RECENT_AGE
+        unusual = [
+            recent.strftime("%Y-%m-%dT%H:%M:%S+09"),
+            "2025-W01-1T00:00:00Z",
+            recent.strftime("%Y-%m-%dT%H:%M:%S+00:00:00"),
+            recent.isoformat(),
+        ]
+        non_strings = [recent, 123, None, 0.0]
+
+        for created in (unusual, non_strings, unusual + non_strings):
+            mask = expired_batch(created, 365)
+            assert mask.tolist() == [expired(c, 365) for c in created]
+
+        # Non-string values carry no parseable ISO timestamp
+        assert expired_batch(non_strings, 365).all()
+    
     def test_score_function(self):
         """Test importance scoring."""
         # High score for recent, frequently used, high confidence
@@ -36,29 +97,37 @@ class TestForgetting:
         score_without_contradiction = score(10, 5, 0.9, 0)
         assert score_with_contradiction < score_without_contradiction
     
-    def test_ttl_policy(self):
+    def test_score_batch_matches_scalar(self):
+        """Test vectorized scoring agrees with the scalar score."""
+        rows = [(10, 5, 0.9, 0), (400, 0, 0.1, 2), (10, 5, 0.9, 3), (0, 10, 1.0, 0)]
+        days, usage, confidence, contradiction = zip(*rows)
+
+        scores = score_batch(days, usage, confidence, contradiction)
+        assert scores.tolist() == pytest.approx([score(*row) for row in rows])
+    
+    def test_ttl_policy(self, now_utc):
         """Test TTL-based forgetting policy."""
         policy = TTLPolicy(ttl_days=365)
         
         # Recent event should not be forgotten
         recent_event = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+            "created": (now_utc - RECENT_AGE).isoformat()
         }
         assert not policy.should_forget(recent_event, {})
         
         # Old event should be forgotten
         old_event = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+            "created": (now_utc - OLD_AGE).isoformat()
         }
         assert policy.should_forget(old_event, {})
     
-    def test_weighted_decay_policy(self):
+    def test_weighted_decay_policy(self, now_utc):
         """Test weighted decay forgetting policy."""
         policy = WeightedDecayPolicy()
         
         # High importance event should not be forgotten
         high_importance_event = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(),
+            "created": (now_utc - RECENT_AGE).isoformat(),
             "importance": 0.9
         }
         context = {"usage_count": 5}
@@ -67,7 +136,7 @@ class TestForgetting:
         # Test that the policy works (even if threshold is very low)
         # We'll test that the score calculation works correctly
         low_importance_event = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(),
+            "created": (now_utc - RECENT_AGE).isoformat(),
             "importance": 0.1
         }
         context = {"usage_count": 0}
@@ -87,7 +156,7 @@ class TestForgetting:
         low_importance_event = {"importance": 0.3}
         assert policy.should_forget(low_importance_event, {})
     
-    def test_composite_policy(self):
+    def test_composite_policy(self, now_utc):
         """Test composite forgetting policy."""
         ttl_policy = TTLPolicy(ttl_days=365)
         importance_policy = ImportanceBasedPolicy(importance_threshold=0.5)
@@ -96,7 +165,7 @@ class TestForgetting:
         composite_any = CompositeForgettingPolicy([ttl_policy, importance_policy], mode="any")
         
         old_low_importance = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=400)).isoformat(),
+            "created": (now_utc - OLD_AGE).isoformat(),
             "importance": 0.3
         }
         assert composite_any.should_forget(old_low_importance, {})
@@ -105,13 +174,13 @@ class TestForgetting:
         composite_all = CompositeForgettingPolicy([ttl_policy, importance_policy], mode="all")
         
         recent_low_importance = {
-            "created": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(),
+            "created": (now_utc - RECENT_AGE).isoformat(),
             "importance": 0.3
         }
         # Should not forget because TTL policy says keep it
         assert not composite_all.should_forget(recent_low_importance, {})
     
-    def test_forgetting_manager(self):
+    def test_forgetting_manager(self, now_utc):
         """Test forgetting manager."""
         policy = TTLPolicy(ttl_days=365)
         manager = ForgettingManager(policy)
@@ -128,11 +197,11 @@ class TestForgetting:
         events = [
             {
                 "topic_id": "event1",
-                "created": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+                "created": (now_utc - RECENT_AGE).isoformat()
             },
             {
                 "topic_id": "event2",
-                "created": (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+                "created": (now_utc - OLD_AGE).isoformat()
             }
         ]
         
@@ -140,6 +209,65 @@ class TestForgetting:
         assert len(filtered_events) == 1
         assert filtered_events[0]["topic_id"] == "event1"
     
+    def test_filter_events_batch_matches_per_event(self, now_utc):
+        """Test vectorized filtering keeps the same events as per-event checks."""
+        manager = create_default_forgetting_policy()
+        manager.update_usage("t2")
+        events = [
+            {"topic_id": "t0", "created": (now_utc - RECENT_AGE).isoformat(), "importance": 0.9},
+            {"topic_id": "t1", "created": (now_utc - RECENT_AGE).isoformat(), "importance": 0.1},
+            {"topic_id": "t2", "created": (now_utc - OLD_AGE).isoformat()},
+            {"topic_id": "t3", "created": "invalid-date"},
+            {"topic_id": "t4"},
+            {"topic_id": "t5", "created": (now_utc - timedelta(days=200)).isoformat()},
+        ]
+
+        filtered = manager.filter_events(events)
+        assert filtered == [e for e in events if not manager.should_forget_event(e)]
+        assert [e["topic_id"] for e in filtered] == ["t0", "t5"]
+
+        contradiction_all = CompositeForgettingPolicy(
+            [ContradictionPolicy(contradiction_threshold=2), ImportanceBasedPolicy(0.5)], mode="all")
+        mask = contradiction_all.should_forget_batch(
+            [{"contradiction_count": 3, "importance": 0.2}, {"contradiction_count": 3}], [{}, {}])
+        assert mask.tolist() == [True, False]
+
+    def test_filter_events_non_string_and_unusual_created(self, now_utc):
+        """Test batch filtering matches per-event checks for non-string or unusual created values."""
+        recent = now_utc - RECENT_AGE
+        created_values = [
+            recent,
+            123,
+            recent.strftime("%Y-%m-%dT%H:%M:%S+09"),
+            "2025-W01-1T00:00:00Z",
+            recent.strftime("%Y-%m-%dT%H:%M:%S+00:00:00"),
+            recent.isoformat(),
+        ]
+        events = [{"topic_id": f"t{i}", "created": c, "importance": 0.0}
+                  for i, c in enumerate(created_values)]
+
+        for policy in (TTLPolicy(ttl_days=365), WeightedDecayPolicy(),
+                       create_default_forgetting_policy().policy):
+            manager = ForgettingManager(policy)
+            for batch in (events, events[:2]):  # mixed, and no strings at all
+                assert manager.filter_events(batch) == \
+                    [e for e in batch if not manager.should_forget_event(e)]
+
+    def test_filter_events_uses_overridden_should_forget_event(self, now_utc):
+        """Test filter_events honours a subclass override of should_forget_event."""
+        class PinnedManager(ForgettingManager):
+            def should_forget_event(self, event_data: dict) -> bool:
+                return not event_data.get("pinned") and super().should_forget_event(event_data)
+
+        manager = PinnedManager(TTLPolicy(ttl_days=365))
+        events = [
+            {"topic_id": "old", "created": (now_utc - OLD_AGE).isoformat()},
+            {"topic_id": "pinned", "created": (now_utc - OLD_AGE).isoformat(), "pinned": True},
+            {"topic_id": "recent", "created": (now_utc - RECENT_AGE).isoformat()},
+        ]
+
+        assert [e["topic_id"] for e in manager.filter_events(events)] == ["pinned", "recent"]
+
     def test_calculate_event_importance(self):
         """Test event importance calculation."""
         # Critical event should have high importance
@@ -165,3 +293,37 @@ class TestForgetting:
         }
         importance = calculate_event_importance(unknown_event)
         assert 0.4 <= importance <= 0.6
+
+    def test_contextual_state_round_trip(self, tmp_path):
+        """Test contextual forgetting state save/load without pickle."""
+        manager = ContextualForgettingManager()
+        manager.update_context("hvac clearance", [
+            {"doc_id": "topic1", "title": "HVAC clearance", "description": "duct"},
+            {"doc_id": "topic2", "title": "Door width", "description": ""}
+        ])
+        manager.update_context("door", [{"doc_id": "topic2", "title": "Door width"}])
+        manager.compute_forgetting_scores()
+
+        state_path = tmp_path / "state.bin"
+        manager.save_state(str(state_path))
+        assert state_path.exists()
+
+        restored = ContextualForgettingManager()
+        restored.load_state(str(state_path))
+
+        assert set(restored.document_stats) == {"topic1", "topic2"}
+        assert restored.document_stats["topic2"]["access_count"] == 2
+        assert restored.document_stats["topic1"]["last_access"] == \
+            manager.document_stats["topic1"]["last_access"]
+        assert restored.document_stats["topic1"]["forgetting_score"] == \
+            pytest.approx(manager.document_stats["topic1"]["forgetting_score"])
+        assert [c["query"] for c in restored.context_history] == ["hvac clearance", "door"]
+        for original, loaded in zip(manager.context_history, restored.context_history):
+            assert list(loaded["context_vector"]) == list(original["context_vector"])
+
+        # Legacy pickle format is still readable behind the flag
+        legacy_path = tmp_path / "state.pkl"
+        manager.save_state(str(legacy_path), legacy=True)
+        legacy = ContextualForgettingManager()
+        legacy.load_state(str(legacy_path), legacy=True)
+        assert legacy.document_stats["topic2"]["access_count"] == 2
@@ -1,13 +1,18 @@
 """Tests for performance optimization."""
-import pytest
+import io
+
 import networkx as nx
-import tempfile
-import os
-# Performance tests - simplified for current implementation
-# from contextualforget.performance import (
-#     GraphOptimizer, ParallelProcessor, MemoryOptimizer, 
-#     CacheManager, PerformanceProfiler, LargeDataProcessor
-# )
+import pytest
+
+from contextualforget.performance import (
+    CacheManager,
+    GraphOptimizer,
+    LargeDataProcessor,
+    MemoryOptimizer,
+    ParallelProcessor,
+    PerformanceProfiler,
+    performance,
+)
 
 
 class TestPerformance:
@@ -48,6 +53,50 @@ class TestPerformance:
         assert len(results["guid0"]) == 1
         assert results["guid0"][0]["topic_id"] == "topic0"
     
+    def test_batch_query_matches_unindexed_scan(self, sample_graph):
+        """Test indexed batch queries return what a full edge scan finds."""
+        from contextualforget.core import expired
+        
+        G = sample_graph.copy()
+        # Several topics on one element, an old topic, a topic without a date
+        # and a non-BCF predecessor
+        G.add_node(("BCF", "old"), title="Old issue", created="2000-01-01T00:00:00Z")
+        G.add_node(("BCF", "undated"), title="No date")
+        G.add_node(("IFC", "container"), type="STOREY")
+        for source in [("BCF", "old"), ("BCF", "undated"), ("IFC", "container")]:
+            G.add_edge(source, ("IFC", "guid0"), type="refersTo", confidence=0.5)
+        G.add_edge(("BCF", "topic1"), ("IFC", "guid0"))
+        
+        def scan(guid, ttl):
+            hits = []
+            for u, v, edge_data in G.edges(data=True):
+                if v != ("IFC", guid) or u[0] != "BCF":
+                    continue
+                created = G.nodes[u].get("created")
+                if ttl > 0 and expired(created or "", ttl):
+                    continue
+                hits.append({
+                    "topic_id": u[1],
+                    "created": created,
+                    "title": G.nodes[u].get("title", ""),
+                    "edge": {
+                        "type": edge_data.get("type", "refersTo"),
+                        "confidence": edge_data.get("confidence", 1.0)
+                    }
+                })
+            return hits
+        
+        optimizer = GraphOptimizer(G)
+        guids = ["guid0", "guid1", "guid9", "container", "missing"]
+        for ttl in (0, 365, 100000):
+            results = optimizer.batch_query(guids, ttl=ttl)
+            assert set(results) == {"guid0", "guid1", "guid9", "container"}
+            for guid, hits in results.items():
+                assert (sorted(hits, key=lambda hit: hit["topic_id"])
+                        == sorted(scan(guid, ttl), key=lambda hit: hit["topic_id"]))
+        
+        assert len(optimizer.batch_query(["guid0"])["guid0"]) == 4
+    
     def test_parallel_processor(self):
         """Test parallel processing functionality."""
         processor = ParallelProcessor(max_workers=2)
@@ -59,32 +108,19 @@ class TestPerformance:
         # Test data processing with a simpler approach
         data_items = [1, 2, 3, 4, 5]
         
-        # Test file processing instead (which doesn't require pickling)
-        import tempfile
-        import os
-        
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-            temp_path = f.name
-            for item in data_items:
-                f.write(f"{item}\n")
-        
-        try:
-            def process_line(line):
-                return int(line.strip()) * 2
-            
-            # Read and process lines
-            results = []
-            with open(temp_path, 'r') as f:
-                for line in f:
-                    results.append(process_line(line))
-            
-            assert len(results) == 5
-            assert results[0] == 2
-            assert results[1] == 4
-            assert results[2] == 6
-            
-        finally:
-            os.unlink(temp_path)
+        # Test line processing instead (which doesn't require pickling)
+        buf = io.StringIO("".join(f"{item}\n" for item in data_items))
+        
+        def process_line(line):
+            return int(line.strip()) * 2
+        
+        # Read and process lines
+        results = [process_line(line) for line in buf]
+        
+        assert len(results) == 5
+        assert results[0] == 2
+        assert results[1] == 4
+        assert results[2] == 6
     
     def test_memory_optimizer(self, sample_graph):
         """Test memory optimization."""
@@ -100,9 +136,9 @@ class TestPerformance:
             # Non-essential fields should be removed
             assert "extra_field" not in data
     
-    def test_cache_manager(self):
+    def test_cache_manager(self, tmp_path):
         """Test cache management."""
-        cache = CacheManager()
+        cache = CacheManager(str(tmp_path / "cache"))
         
         # Test caching
         test_data = {"key": "value", "number": 42}
@@ -119,6 +155,23 @@ class TestPerformance:
         cache.clear()
         assert cache.get("test_key") is None
     
+    def test_cache_manager_ttl(self, tmp_path, monkeypatch):
+        """Test TTL entries expire lazily on get while plain entries persist."""
+        now = [1000.0]
+        monkeypatch.setattr(performance.time, "time", lambda: now[0])
+        cache = CacheManager(str(tmp_path / "cache"))
+        
+        cache.set("short_lived", {"n": 1}, ttl=10)
+        cache.set("forever", {"n": 2})
+        
+        now[0] += 9.5
+        assert cache.get("short_lived") == {"n": 1}
+        
+        now[0] += 1.0
+        assert cache.get("short_lived") is None
+        assert not cache.get_cache_path("short_lived").exists()
+        assert cache.get("forever") == {"n": 2}
+    
     def test_performance_profiler(self):
         """Test performance profiling."""
         profiler = PerformanceProfiler()
@@ -151,61 +204,50 @@ class TestPerformance:
             {"id": 5, "value": "e"}
         ]
         
-        # Create a temporary JSONL file
-        import tempfile
+        # Build the JSONL content in memory
         import json
-        import os
-        
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.jsonl') as f:
-            temp_path = f.name
-            for item in test_data:
-                f.write(json.dumps(item) + "\n")
-        
-        try:
-            # Test the file reading part manually (since ProcessPoolExecutor has issues with local functions)
-            results = []
-            with open(temp_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    item = json.loads(line.strip())
-                    processed = {"processed": item["id"], "value": item["value"].upper()}
-                    results.append(processed)
-            
-            assert len(results) == 5
-            assert results[0]["processed"] == 1
-            assert results[0]["value"] == "A"
-            
-        finally:
-            os.unlink(temp_path)
+        
+        buf = io.BytesIO("".join(json.dumps(item) + "\n" for item in test_data).encode("utf-8"))
+        
+        # Test the line parsing part manually (since ProcessPoolExecutor has issues with local functions)
+        items = [json.loads(line) for line in buf.getvalue().splitlines() if line]
+        results = [{"processed": item["id"], "value": item["value"].upper()} for item in items]
+        
+        assert len(results) == 5
+        assert results[0]["processed"] == 1
+        assert results[0]["value"] == "A"
     
     def test_graph_compression_ratio(self, sample_graph):
         """Test graph compression effectiveness."""
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            original_path = f.name
-        
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            compressed_path = f.name
-        
-        try:
-            # Save original graph
-            import pickle
-            with open(original_path, 'wb') as f:
-                pickle.dump(sample_graph, f)
-            
-            # Save compressed graph
-            MemoryOptimizer.save_graph_compressed(sample_graph, compressed_path)
-            
-            # Check file sizes
-            original_size = os.path.getsize(original_path)
-            compressed_size = os.path.getsize(compressed_path)
-            
-            # Compressed should be smaller or equal
-            assert compressed_size <= original_size
-            
-            # Load and verify compressed graph
-            loaded_graph = MemoryOptimizer.load_graph_compressed(compressed_path)
-            assert loaded_graph.number_of_nodes() == sample_graph.number_of_nodes()
-            assert loaded_graph.number_of_edges() == sample_graph.number_of_edges()
-            
-        finally:
-            os.unlink(original_path)
-            os.unlink(compressed_path)
+        import pickle
+        
+        # Serialize both graphs in memory with the same protocol
+        original = pickle.dumps(sample_graph, protocol=pickle.HIGHEST_PROTOCOL)
+        compressed = MemoryOptimizer.dumps_graph_compressed(sample_graph)
+        
+        # Compressed should be smaller or equal
+        assert len(compressed) <= len(original)
+        
+        # Load and verify compressed graph
+        loaded_graph = MemoryOptimizer.loads_graph_compressed(compressed)
+        assert loaded_graph.number_of_nodes() == sample_graph.number_of_nodes()
+        assert loaded_graph.number_of_edges() == sample_graph.number_of_edges()
+    
+    def test_graph_compressed_round_trip(self, sample_graph, tmp_path):
+        """Test compressed bytes and files round-trip tuple node ids and edge attributes."""
+        expected = MemoryOptimizer.compress_graph(sample_graph)
+        
+        loaded = MemoryOptimizer.loads_graph_compressed(
+            MemoryOptimizer.dumps_graph_compressed(sample_graph))
+        
+        assert isinstance(loaded, nx.DiGraph)
+        assert list(loaded.nodes(data=True)) == list(expected.nodes(data=True))
+        assert list(loaded.edges(data=True)) == list(expected.edges(data=True))
+        assert ("BCF", "topic3") in loaded
+        assert loaded.edges[("BCF", "topic3"), ("IFC", "guid3")] == {
+            "type": "refersTo", "confidence": pytest.approx(0.86)}
+        
+        path = tmp_path / "graph.pkl"
+        MemoryOptimizer.save_graph_compressed(sample_graph, str(path))
+        from_file = MemoryOptimizer.load_graph_compressed(str(path))
+        assert list(from_file.edges(data=True)) == list(expected.edges(data=True))
@@ -4,6 +4,8 @@ Phase 1 통합 테스트
 """
 import pickle
 import sys
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
 import networkx as nx
@@ -13,22 +15,77 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 
+GRAPH_PATH = Path('data/processed/graph.gpickle')
+
+
+@lru_cache(maxsize=None)
+def _load_graph(path: Path):
+    """그래프를 한 번만 역직렬화해 읽기 전용으로 공유 (테스트에서 변경 금지)"""
+    # 파일을 한 번에 읽어 역직렬화 (버퍼링된 파일 객체의 잦은 read 호출 생략)
+    graph = pickle.loads(path.read_bytes())
+    
+    # Phase 1 노드 형식 불변식을 로드 시 한 번만 확인 (이후 분류 루프는 n[0]만 비교)
+    assert all(isinstance(n, tuple) and len(n) == 2 for n in graph.nodes), \
+        "그래프에 ('IFC'|'BCF', id) 튜플 형식이 아닌 노드가 있습니다"
+    return nx.freeze(graph)
+
+
+@lru_cache(maxsize=None)
+def _isolates(graph):
+    """고아 노드 집합 (읽기 전용 그래프당 한 번 계산)"""
+    return frozenset(nx.isolates(graph))
+
+
+def _partition_nodes(graph):
+    """노드를 한 번 순회해 IFC/BCF 노드와 고아 BCF 노드로 분류"""
+    ifc_nodes, bcf_nodes = [], []
+    for n in graph.nodes:
+        if n[0] == 'IFC':
+            ifc_nodes.append(n)
+        elif n[0] == 'BCF':
+            bcf_nodes.append(n)
+    # 고아 BCF 노드는 집합 교집합으로 계산
+    isolated_bcf = _isolates(graph).intersection(bcf_nodes)
+    return ifc_nodes, bcf_nodes, isolated_bcf
+
+
 class TestPhase1Integration:
     """Phase 1 통합 테스트"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def graph_path(self):
         """그래프 파일 경로"""
-        return Path('data/processed/graph.gpickle')
+        return GRAPH_PATH
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def graph(self, graph_path):
-        """그래프 로드"""
+        """그래프 로드 (모듈 내 모든 테스트가 공유)"""
         if not graph_path.exists():
             pytest.skip("그래프 파일이 없습니다")
         
-        with open(graph_path, 'rb') as f:
-            return pickle.load(f)
+        return _load_graph(graph_path)
+    
+    @pytest.fixture(scope="module")
+    def node_partition(self, graph):
+        """(IFC 노드, BCF 노드, 고아 BCF 노드)"""
+        return _partition_nodes(graph)
+    
+    @pytest.fixture(scope="module")
+    def graph_isolates(self, graph):
+        """고아 노드 집합"""
+        return _isolates(graph)
+    
+    @pytest.fixture(scope="module")
+    def graph_density(self, graph):
+        """그래프 밀도"""
+        return nx.density(graph)
+    
+    @pytest.fixture(scope="module")
+    def graph_components(self, graph):
+        """(약)연결 컴포넌트 목록"""
+        if graph.is_directed():
+            return list(nx.weakly_connected_components(graph))
+        return list(nx.connected_components(graph))
     
     def test_graph_exists(self, graph_path):
         """테스트 1: 그래프 파일이 존재하는지 확인"""
@@ -49,16 +106,14 @@ class TestPhase1Integration:
     
     def test_node_format_is_tuple(self, graph):
         """테스트 4: 모든 노드가 튜플 형식인지 확인"""
-        for node in list(graph.nodes)[:100]:  # 샘플링
+        for node in islice(graph.nodes, 100):  # 샘플링
             assert isinstance(node, tuple), f"노드 {node}는 튜플이 아닙니다"
             assert len(node) == 2, f"노드 {node}의 길이가 2가 아닙니다"
             assert node[0] in ['IFC', 'BCF'], f"노드 {node}의 타입이 올바르지 않습니다"
     
-    def test_bcf_isolated_nodes_rate(self, graph):
+    def test_bcf_isolated_nodes_rate(self, node_partition):
         """테스트 5: BCF 고아 노드 비율 <= 60%"""
-        bcf_nodes = [n for n in graph.nodes if isinstance(n, tuple) and n[0] == 'BCF']
-        isolated = list(nx.isolates(graph))
-        isolated_bcf = [n for n in isolated if isinstance(n, tuple) and n[0] == 'BCF']
+        _, bcf_nodes, isolated_bcf = node_partition
         
         isolated_bcf_rate = len(isolated_bcf) / len(bcf_nodes) * 100 if bcf_nodes else 0
         
@@ -67,10 +122,9 @@ class TestPhase1Integration:
         
         print(f"✅ BCF 고아 노드 비율: {isolated_bcf_rate:.2f}%")
     
-    def test_ifc_and_bcf_nodes_exist(self, graph):
+    def test_ifc_and_bcf_nodes_exist(self, node_partition):
         """테스트 6: IFC와 BCF 노드가 모두 존재하는지 확인"""
-        ifc_nodes = [n for n in graph.nodes if isinstance(n, tuple) and n[0] == 'IFC']
-        bcf_nodes = [n for n in graph.nodes if isinstance(n, tuple) and n[0] == 'BCF']
+        ifc_nodes, bcf_nodes, _ = node_partition
         
         assert len(ifc_nodes) > 0, "IFC 노드가 없습니다"
         assert len(bcf_nodes) > 0, "BCF 노드가 없습니다"
@@ -81,9 +135,7 @@ class TestPhase1Integration:
     def test_edges_connect_bcf_to_ifc(self, graph):
         """테스트 7: 엣지가 BCF → IFC를 연결하는지 확인"""
         # 샘플 엣지 검증
-        edges = list(graph.edges)[:10]
-        
-        for source, target in edges:
+        for source, target in islice(graph.edges, 10):
             # 방향성 그래프인 경우 BCF → IFC
             if isinstance(source, tuple) and isinstance(target, tuple):
                 # BCF가 source인지, 또는 target인지 확인
@@ -92,35 +144,30 @@ class TestPhase1Integration:
     
     def test_edge_attributes(self, graph):
         """테스트 8: 엣지 속성 확인"""
-        edges_with_data = list(graph.edges(data=True))[:10]
-        
-        for source, target, data in edges_with_data:
+        for source, target, data in islice(graph.edges(data=True), 10):
             # confidence 속성 확인
             if 'confidence' in data:
                 assert 0.0 <= data['confidence'] <= 1.0, \
                     f"엣지 {source} → {target}의 confidence가 범위를 벗어났습니다: {data['confidence']}"
     
-    def test_graph_statistics(self, graph):
+    def test_graph_statistics(self, graph, graph_density, graph_isolates):
         """테스트 9: 그래프 기본 통계"""
         num_nodes = graph.number_of_nodes()
         num_edges = graph.number_of_edges()
-        density = nx.density(graph)
+        density = graph_density
         
         print(f"\\n📊 그래프 통계:")
         print(f"   노드: {num_nodes:,}개")
         print(f"   엣지: {num_edges:,}개")
         print(f"   밀도: {density:.6f}")
+        print(f"   고아 노드: {len(graph_isolates):,}개")
         
         assert num_nodes > 0, "노드가 없습니다"
         assert num_edges > 0, "엣지가 없습니다"
     
-    def test_connected_components(self, graph):
+    def test_connected_components(self, graph_components):
         """테스트 10: 연결 컴포넌트 분석"""
-        if graph.is_directed():
-            components = list(nx.weakly_connected_components(graph))
-        else:
-            components = list(nx.connected_components(graph))
-        
+        components = graph_components
         largest = max(components, key=len) if components else set()
         
         print(f"\\n🔗 연결성:")
@@ -134,7 +181,7 @@ class TestPhase1Integration:
 def test_phase1_completion():
     """Phase 1 완료 종합 테스트"""
     # 1. 그래프 파일 확인
-    graph_path = Path('data/processed/graph.gpickle')
+    graph_path = GRAPH_PATH
     assert graph_path.exists(), "그래프 파일이 없습니다"
     
     # 2. 링크 파일 확인
@@ -142,15 +189,10 @@ def test_phase1_completion():
     assert links_path.exists(), "링크 파일이 없습니다"
     
     # 3. 그래프 로드 및 검증
-    with open(graph_path, 'rb') as f:
-        graph = pickle.load(f)
+    graph = _load_graph(graph_path)
     
     num_edges = graph.number_of_edges()
-    ifc_nodes = [n for n in graph.nodes if isinstance(n, tuple) and n[0] == 'IFC']
-    bcf_nodes = [n for n in graph.nodes if isinstance(n, tuple) and n[0] == 'BCF']
-    
-    isolated = list(nx.isolates(graph))
-    isolated_bcf = [n for n in isolated if isinstance(n, tuple) and n[0] == 'BCF']
+    ifc_nodes, bcf_nodes, isolated_bcf = _partition_nodes(graph)
     isolated_bcf_rate = len(isolated_bcf) / len(bcf_nodes) * 100 if bcf_nodes else 0
     
     print(f"\\n🎉 Phase 1 완료 검증:")
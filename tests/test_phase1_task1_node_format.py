@@ -5,6 +5,7 @@ Phase 1 - Task 1.1 단위 테스트
 import pickle
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import networkx as nx
 import pytest
@@ -12,16 +13,24 @@ import pytest
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from contextualforget.data.build_graph import build_graph_from_files
 from contextualforget.core import write_jsonl
 
+# 허용되는 노드 타입 (첫 번째 튜플 요소)
+_NODE_TYPES = frozenset(('IFC', 'BCF'))
+
+# 속성 검증에 반복 사용하는 노드 키
+_IFC_NODE_1 = ('IFC', 'test_guid_001')
+_BCF_NODE_1 = ('BCF', 'bcf_topic_001')
+
 
 class TestPhase1Task1NodeFormat:
     """노드 형식 검증 테스트"""
     
-    @pytest.fixture
-    def temp_data_files(self, tmp_path):
-        """임시 테스트 데이터 생성"""
+    @pytest.fixture(scope="module")
+    def temp_data_files(self, tmp_path_factory):
+        """임시 테스트 데이터 생성 (모듈당 한 번)"""
+        # write_jsonl이 orjson 직렬화와 청크 단위 단일 write를 이미 수행하므로 별도 헬퍼 없이 사용
+        tmp_path = tmp_path_factory.mktemp("phase1_task1")
         # IFC 데이터
         ifc_data = [
             {
@@ -78,174 +87,128 @@ class TestPhase1Task1NodeFormat:
             'links_file': str(links_file)
         }
     
-    def test_node_format_is_tuple(self, temp_data_files):
-        """테스트 1: 모든 노드가 튜플 형식인지 확인"""
-        G = build_graph_from_files(
+    @pytest.fixture(scope="module")
+    def built_graph(self, temp_data_files, build_graph_cached):
+        """테스트 데이터로 구축한 그래프와 노드 분류 (모듈당 한 번, 테스트에서 변경 금지)"""
+        G = build_graph_cached(
             temp_data_files['ifc_files'],
             temp_data_files['bcf_files'],
             temp_data_files['links_file']
         )
-        
+        nodes = tuple(G.nodes)
+        # 형식 검증 4종과 IFC/BCF 분류를 노드 한 번 순회로 처리 (각 테스트는 위반 목록만 확인)
+        not_tuple, not_pair, bad_type, bad_id = [], [], [], []
+        ifc, bcf = set(), set()
+        for node in nodes:
+            if not isinstance(node, tuple):
+                not_tuple.append(node)
+                continue
+            if len(node) != 2:
+                not_pair.append(node)
+                continue
+            if node[0] == 'IFC':
+                ifc.add(node)
+            elif node[0] == 'BCF':
+                bcf.add(node)
+            else:
+                bad_type.append(node)
+            if not isinstance(node[1], str) or not node[1]:
+                bad_id.append(node)
+        return SimpleNamespace(
+            G=G,
+            nodes=nodes,
+            ifc=frozenset(ifc),
+            bcf=frozenset(bcf),
+            not_tuple=not_tuple,
+            not_pair=not_pair,
+            bad_type=bad_type,
+            bad_id=bad_id
+        )
+    
+    def test_node_format_is_tuple(self, built_graph):
+        """테스트 1: 모든 노드가 튜플 형식인지 확인"""
         # 모든 노드가 튜플이어야 함
-        for node in G.nodes:
-            assert isinstance(node, tuple), f"노드 {node}는 튜플이 아닙니다: {type(node)}"
+        assert not built_graph.not_tuple, f"튜플이 아닌 노드가 있습니다: {built_graph.not_tuple}"
     
-    def test_node_format_is_two_element_tuple(self, temp_data_files):
+    def test_node_format_is_two_element_tuple(self, built_graph):
         """테스트 2: 모든 노드가 2개 요소로 구성된 튜플인지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        for node in G.nodes:
-            assert len(node) == 2, f"노드 {node}는 2개 요소가 아닙니다: {len(node)}개"
+        assert not built_graph.not_pair, f"2개 요소가 아닌 노드가 있습니다: {built_graph.not_pair}"
     
-    def test_node_format_first_element_is_type(self, temp_data_files):
+    def test_node_format_first_element_is_type(self, built_graph):
         """테스트 3: 첫 번째 요소가 'IFC' 또는 'BCF'인지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        for node in G.nodes:
-            assert node[0] in ['IFC', 'BCF'], \
-                f"노드 {node}의 첫 요소가 'IFC' 또는 'BCF'가 아닙니다: {node[0]}"
+        assert not built_graph.bad_type, \
+            f"첫 요소가 'IFC' 또는 'BCF'가 아닌 노드가 있습니다: {built_graph.bad_type}"
     
-    def test_node_format_second_element_is_id(self, temp_data_files):
+    def test_node_format_second_element_is_id(self, built_graph):
         """테스트 4: 두 번째 요소가 문자열 ID인지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        for node in G.nodes:
-            assert isinstance(node[1], str), \
-                f"노드 {node}의 두 번째 요소가 문자열이 아닙니다: {type(node[1])}"
-            assert len(node[1]) > 0, \
-                f"노드 {node}의 ID가 빈 문자열입니다"
+        assert not built_graph.bad_id, \
+            f"두 번째 요소가 비어 있지 않은 문자열 ID가 아닌 노드가 있습니다: {built_graph.bad_id}"
     
-    def test_ifc_nodes_count(self, temp_data_files):
+    def test_ifc_nodes_count(self, built_graph):
         """테스트 5: IFC 노드 수 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        ifc_nodes = [n for n in G.nodes if n[0] == 'IFC']
-        assert len(ifc_nodes) == 2, f"IFC 노드가 2개가 아닙니다: {len(ifc_nodes)}개"
+        assert len(built_graph.ifc) == 2, f"IFC 노드가 2개가 아닙니다: {len(built_graph.ifc)}개"
     
-    def test_bcf_nodes_count(self, temp_data_files):
+    def test_bcf_nodes_count(self, built_graph):
         """테스트 6: BCF 노드 수 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        bcf_nodes = [n for n in G.nodes if n[0] == 'BCF']
-        assert len(bcf_nodes) == 2, f"BCF 노드가 2개가 아닙니다: {len(bcf_nodes)}개"
+        assert len(built_graph.bcf) == 2, f"BCF 노드가 2개가 아닙니다: {len(built_graph.bcf)}개"
     
-    def test_edges_exist(self, temp_data_files):
+    def test_edges_exist(self, built_graph):
         """테스트 7: 엣지가 생성되었는지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        assert G.number_of_edges() > 0, "엣지가 생성되지 않았습니다"
-        assert G.number_of_edges() == 2, f"엣지가 2개가 아닙니다: {G.number_of_edges()}개"
+        num_edges = built_graph.G.number_of_edges()
+        assert num_edges > 0, "엣지가 생성되지 않았습니다"
+        assert num_edges == 2, f"엣지가 2개가 아닙니다: {num_edges}개"
     
-    def test_edge_format(self, temp_data_files):
+    def test_edge_format(self, built_graph):
         """테스트 8: 엣지 형식 확인 (BCF → IFC)"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        for source, target in G.edges:
+        for source, target in built_graph.G.edges:
             assert source[0] == 'BCF', f"엣지 소스가 BCF가 아닙니다: {source}"
             assert target[0] == 'IFC', f"엣지 타겟이 IFC가 아닙니다: {target}"
     
-    def test_node_attributes(self, temp_data_files):
+    def test_node_attributes(self, built_graph):
         """테스트 9: 노드 속성이 보존되었는지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
+        # 노드 속성 dict를 한 번만 가져옴
+        attrs = dict(built_graph.G.nodes(data=True))
         
         # IFC 노드 속성 확인
-        ifc_node = ('IFC', 'test_guid_001')
-        assert ifc_node in G.nodes, f"IFC 노드 {ifc_node}가 없습니다"
-        assert G.nodes[ifc_node]['type'] == 'IfcWall'
-        assert G.nodes[ifc_node]['name'] == '테스트 벽체'
-        assert G.nodes[ifc_node]['node_type'] == 'IFC'
+        ifc_node = _IFC_NODE_1
+        assert ifc_node in attrs, f"IFC 노드 {ifc_node}가 없습니다"
+        ifc_attrs = attrs[ifc_node]
+        assert ifc_attrs['type'] == 'IfcWall'
+        assert ifc_attrs['name'] == '테스트 벽체'
+        assert ifc_attrs['node_type'] == 'IFC'
         
         # BCF 노드 속성 확인
-        bcf_node = ('BCF', 'bcf_topic_001')
-        assert bcf_node in G.nodes, f"BCF 노드 {bcf_node}가 없습니다"
-        assert G.nodes[bcf_node]['title'] == '테스트 이슈 1'
-        assert G.nodes[bcf_node]['node_type'] == 'BCF'
+        bcf_node = _BCF_NODE_1
+        assert bcf_node in attrs, f"BCF 노드 {bcf_node}가 없습니다"
+        bcf_attrs = attrs[bcf_node]
+        assert bcf_attrs['title'] == '테스트 이슈 1'
+        assert bcf_attrs['node_type'] == 'BCF'
     
-    def test_edge_attributes(self, temp_data_files):
+    def test_edge_attributes(self, built_graph):
         """테스트 10: 엣지 속성이 보존되었는지 확인"""
-        G = build_graph_from_files(
-            temp_data_files['ifc_files'],
-            temp_data_files['bcf_files'],
-            temp_data_files['links_file']
-        )
-        
-        bcf_node = ('BCF', 'bcf_topic_001')
-        ifc_node = ('IFC', 'test_guid_001')
+        bcf_node = _BCF_NODE_1
+        ifc_node = _IFC_NODE_1
         
-        assert G.has_edge(bcf_node, ifc_node), f"엣지 {bcf_node} → {ifc_node}가 없습니다"
+        assert built_graph.G.has_edge(bcf_node, ifc_node), f"엣지 {bcf_node} → {ifc_node}가 없습니다"
         
-        edge_data = G.edges[bcf_node, ifc_node]
+        edge_data = built_graph.G.edges[bcf_node, ifc_node]
         assert edge_data['type'] == 'refersTo'
         assert edge_data['confidence'] == 0.9
         assert 'evidence' in edge_data
 
 
-def test_build_graph_integration():
-    """통합 테스트: 실제 파일로 그래프 구축"""
-    # 실제 데이터가 있는 경우에만 실행
-    data_dir = Path('data/processed')
-    
-    if not data_dir.exists():
-        pytest.skip("data/processed 디렉토리가 없습니다")
-    
-    ifc_files = list(data_dir.glob('*_ifc.jsonl'))
-    bcf_files = list(data_dir.glob('*_bcf.jsonl'))
-    
-    if not ifc_files or not bcf_files:
-        pytest.skip("IFC 또는 BCF 파일이 없습니다")
-    
-    # 샘플 링크 파일 사용
-    links_file = data_dir / 'sample_links.jsonl'
-    if not links_file.exists():
-        pytest.skip("sample_links.jsonl 파일이 없습니다")
-    
-    # 처음 5개 파일만 테스트
-    G = build_graph_from_files(
-        [str(f) for f in ifc_files[:5]],
-        [str(f) for f in bcf_files[:5]],
-        str(links_file)
-    )
+def test_build_graph_integration(real_graph):
+    """통합 테스트: 실제 파일로 그래프 구축 (세션 공용 그래프 사용)"""
+    G = real_graph
     
     # 기본 검증
     assert G.number_of_nodes() > 0, "노드가 생성되지 않았습니다"
     
-    # 모든 노드가 튜플 형식인지 확인
-    for node in G.nodes:
+    # 모든 노드가 튜플 형식인지 확인 (그래프를 직접 순회, 뷰 인덱싱 없음)
+    for node in G:
         assert isinstance(node, tuple), f"노드 {node}는 튜플이 아닙니다"
         assert len(node) == 2, f"노드 {node}는 2개 요소가 아닙니다"
-        assert node[0] in ['IFC', 'BCF'], f"노드 {node}의 타입이 올바르지 않습니다"
+        assert node[0] in _NODE_TYPES, f"노드 {node}의 타입이 올바르지 않습니다"
     
     print(f"✅ 통합 테스트 통과: 노드 {G.number_of_nodes()}개, 엣지 {G.number_of_edges()}개")
 
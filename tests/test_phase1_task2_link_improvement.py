@@ -21,54 +21,34 @@ from contextualforget.data.link_ifc_bcf import (
 class TestGUIDExtraction:
     """GUID 추출 테스트"""
     
-    def test_extract_basic_guid(self):
-        """테스트 1: 기본 GUID 추출"""
-        text = "GUID 1kTvXnbbzCWw8lcMd1dR4o를 확인하세요"
+    @pytest.mark.parametrize("text,expected", [
+        # 기본 GUID 추출
+        ("GUID 1kTvXnbbzCWw8lcMd1dR4o를 확인하세요", {"1kTvXnbbzCWw8lcMd1dR4o"}),
+        # 여러 GUID 추출
+        ("GUID 1kTvXnbbzCWw8lcMd1dR4o와 23sFQGRy90RxVbRHD9iSE2 확인",
+         {"1kTvXnbbzCWw8lcMd1dR4o", "23sFQGRy90RxVbRHD9iSE2"}),
+        # 특수문자 포함 GUID 추출 (_, $)
+        ("GUID 1kTvXnbbzCWw8lcMd1_$4o 확인", {"1kTvXnbbzCWw8lcMd1_$4o"}),
+        # GUID가 없는 경우
+        ("이 텍스트에는 GUID가 없습니다", set()),
+        # 잘못된 길이의 GUID 제외
+        ("짧은GUID: abc123, 올바른GUID: 1kTvXnbbzCWw8lcMd1dR4o", {"1kTvXnbbzCWw8lcMd1dR4o"}),
+        # 중복 GUID 제거
+        ("GUID 1kTvXnbbzCWw8lcMd1dR4o 그리고 다시 1kTvXnbbzCWw8lcMd1dR4o", {"1kTvXnbbzCWw8lcMd1dR4o"}),
+    ], ids=["basic", "multi", "special", "none", "invalid_len", "dedup"])
+    def test_extract_guid(self, text, expected):
+        """테스트 1-6: GUID 추출 (기본/여러 개/특수문자/없음/길이 오류/중복)"""
         guids = extract_guid_from_text(text)
-        assert len(guids) == 1
-        assert "1kTvXnbbzCWw8lcMd1dR4o" in guids
-    
-    def test_extract_multiple_guids(self):
-        """테스트 2: 여러 GUID 추출"""
-        text = "GUID 1kTvXnbbzCWw8lcMd1dR4o와 23sFQGRy90RxVbRHD9iSE2 확인"
-        guids = extract_guid_from_text(text)
-        assert len(guids) == 2
-        assert "1kTvXnbbzCWw8lcMd1dR4o" in guids
-        assert "23sFQGRy90RxVbRHD9iSE2" in guids
-    
-    def test_extract_guid_with_special_chars(self):
-        """테스트 3: 특수문자 포함 GUID 추출 (_, $)"""
-        text = "GUID 1kTvXnbbzCWw8lcMd1_$4o 확인"
-        guids = extract_guid_from_text(text)
-        assert len(guids) == 1
-        assert "1kTvXnbbzCWw8lcMd1_$4o" in guids
-    
-    def test_extract_no_guid(self):
-        """테스트 4: GUID가 없는 경우"""
-        text = "이 텍스트에는 GUID가 없습니다"
-        guids = extract_guid_from_text(text)
-        assert len(guids) == 0
-    
-    def test_extract_invalid_length(self):
-        """테스트 5: 잘못된 길이의 GUID 제외"""
-        text = "짧은GUID: abc123, 올바른GUID: 1kTvXnbbzCWw8lcMd1dR4o"
-        guids = extract_guid_from_text(text)
-        assert len(guids) == 1
-        assert "1kTvXnbbzCWw8lcMd1dR4o" in guids
-    
-    def test_extract_guid_deduplication(self):
-        """테스트 6: 중복 GUID 제거"""
-        text = "GUID 1kTvXnbbzCWw8lcMd1dR4o 그리고 다시 1kTvXnbbzCWw8lcMd1dR4o"
-        guids = extract_guid_from_text(text)
-        assert len(guids) == 1
+        assert len(guids) == len(expected)
+        assert set(guids) == expected
 
 
 class TestTFIDFMatching:
     """TF-IDF 매칭 테스트"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_ifc_items(self):
-        """샘플 IFC 데이터"""
+        """샘플 IFC 데이터 (모듈당 한 번 생성, 읽기 전용)"""
         return {
             'guid001': {
                 'guid': 'guid001',
@@ -133,74 +113,46 @@ class TestTFIDFMatching:
 class TestKeywordMatching:
     """키워드 매칭 테스트"""
     
-    def test_keyword_exact_korean_match(self):
-        """테스트 12: 정확한 한국어 키워드 매칭"""
-        bcf_text = "벽체에 균열이 발생했습니다"
-        ifc_item = {'name': '외벽', 'type': 'IfcWall'}
-        
-        score = semantic_match_keyword(bcf_text, ifc_item)
-        assert score > 0  # 벽 키워드 매칭
-    
-    def test_keyword_exact_english_match(self):
-        """테스트 13: 정확한 영어 키워드 매칭"""
-        bcf_text = "wall crack issue"
-        ifc_item = {'name': 'External Wall', 'type': 'IfcWall'}
-        
-        score = semantic_match_keyword(bcf_text, ifc_item)
-        assert score > 0  # wall 키워드 매칭
-    
-    def test_keyword_mixed_language(self):
-        """테스트 14: 한영 혼합 키워드 매칭"""
-        bcf_text = "door 문이 닫히지 않습니다"
-        ifc_item = {'name': '출입문', 'type': 'IfcDoor'}
-        
-        score = semantic_match_keyword(bcf_text, ifc_item)
-        assert score > 0  # 문/door 키워드 매칭
-    
-    def test_keyword_no_match(self):
-        """테스트 15: 키워드 매칭 없음"""
-        bcf_text = "some random text"
-        ifc_item = {'name': '벽체', 'type': 'IfcWall'}
-        
+    @pytest.mark.parametrize("bcf_text,ifc_item,matched", [
+        # 정확한 한국어 키워드 매칭 (벽)
+        ("벽체에 균열이 발생했습니다", {'name': '외벽', 'type': 'IfcWall'}, True),
+        # 정확한 영어 키워드 매칭 (wall)
+        ("wall crack issue", {'name': 'External Wall', 'type': 'IfcWall'}, True),
+        # 한영 혼합 키워드 매칭 (문/door)
+        ("door 문이 닫히지 않습니다", {'name': '출입문', 'type': 'IfcDoor'}, True),
+        # 키워드 매칭 없음
+        ("some random text", {'name': '벽체', 'type': 'IfcWall'}, False),
+        # 점수 범위만 확인
+        ("벽체 문 창문 기둥 바닥", {'name': '종합 건물 요소', 'type': 'IfcBuildingElement'}, None),
+    ], ids=["korean", "english", "mixed", "no_match", "range"])
+    def test_keyword_match(self, bcf_text, ifc_item, matched):
+        """테스트 12-16: 키워드 매칭 (한국어/영어/혼합/매칭 없음/점수 범위 0.0 ~ 1.0)"""
         score = semantic_match_keyword(bcf_text, ifc_item)
-        assert score == 0
-    
-    def test_keyword_score_range(self):
-        """테스트 16: 키워드 점수 범위 (0.0 ~ 1.0)"""
-        bcf_text = "벽체 문 창문 기둥 바닥"
-        ifc_item = {'name': '종합 건물 요소', 'type': 'IfcBuildingElement'}
         
-        score = semantic_match_keyword(bcf_text, ifc_item)
         assert 0.0 <= score <= 1.0
+        if matched is True:
+            assert score > 0
+        elif matched is False:
+            assert score == 0
 
 
 class TestConfidenceCalculation:
     """신뢰도 계산 테스트"""
     
-    def test_direct_guid_confidence(self):
-        """테스트 17: 직접 GUID 신뢰도"""
-        confidence = calculate_confidence('direct_guid')
-        assert confidence == 1.0
-    
-    def test_tfidf_high_confidence(self):
-        """테스트 18: 높은 TF-IDF 신뢰도"""
-        confidence = calculate_confidence('tfidf', score=0.8)
-        assert 0.5 <= confidence <= 0.7
-    
-    def test_tfidf_medium_confidence(self):
-        """테스트 19: 중간 TF-IDF 신뢰도"""
-        confidence = calculate_confidence('tfidf', score=0.3)
-        assert 0.2 <= confidence <= 0.5
-    
-    def test_keyword_confidence(self):
-        """테스트 20: 키워드 신뢰도"""
-        confidence = calculate_confidence('keyword', score=0.5)
-        assert 0.2 <= confidence <= 0.4
-    
-    def test_unknown_match_type(self):
-        """테스트 21: 알 수 없는 매칭 타입"""
-        confidence = calculate_confidence('unknown_type')
-        assert confidence == 0.2  # 기본값
+    @pytest.mark.parametrize("match_type,score,lo,hi", [
+        ("direct_guid", None, 1.0, 1.0),
+        ("tfidf", 0.8, 0.5, 0.7),
+        ("tfidf", 0.3, 0.2, 0.5),
+        ("keyword", 0.5, 0.2, 0.4),
+        ("unknown_type", None, 0.2, 0.2),  # 기본값
+    ], ids=["direct", "tfidf_hi", "tfidf_med", "keyword", "unknown"])
+    def test_confidence(self, match_type, score, lo, hi):
+        """테스트 17-21: 매칭 타입/점수별 신뢰도"""
+        if score is None:
+            confidence = calculate_confidence(match_type)
+        else:
+            confidence = calculate_confidence(match_type, score=score)
+        assert lo <= confidence <= hi
     
     def test_confidence_range(self):
         """테스트 22: 신뢰도 범위 (0.0 ~ 1.0)"""
@@ -211,32 +163,24 @@ class TestConfidenceCalculation:
                     f"신뢰도 {confidence}가 범위를 벗어났습니다 (타입: {match_type}, 점수: {score})"
 
 
-def test_integration_link_generation():
-    """통합 테스트: 실제 파일로 링크 생성"""
-    data_dir = Path('data/processed')
-    
-    if not data_dir.exists():
-        pytest.skip("data/processed 디렉토리가 없습니다")
-    
-    ifc_files = list(data_dir.glob('*_ifc.jsonl'))
-    bcf_files = list(data_dir.glob('*_bcf.jsonl'))
-    
-    if not ifc_files or not bcf_files:
-        pytest.skip("IFC 또는 BCF 파일이 없습니다")
+def test_integration_link_generation(real_data_files):
+    """통합 테스트: 실제 파일로 링크 생성 (세션 공용 파일 목록 사용)"""
+    ifc_files = real_data_files['ifc_files']
+    bcf_files = real_data_files['bcf_files']
     
     # 첫 번째 파일로 테스트
     from contextualforget.core import read_jsonl
     
-    ifc_data = list(read_jsonl(str(ifc_files[0])))
-    bcf_data = list(read_jsonl(str(bcf_files[0])))
+    # IFC는 스트림에서 바로 dict로, BCF는 첫 레코드만 읽음 (중간 리스트 없음)
+    ifc_map = {item['guid']: item for item in read_jsonl(str(ifc_files[0]))}
+    bcf_first = next(iter(read_jsonl(str(bcf_files[0]))), None)
     
-    if not ifc_data or not bcf_data:
+    if not ifc_map or bcf_first is None:
         pytest.skip("IFC 또는 BCF 데이터가 비어있습니다")
     
-    ifc_map = {item['guid']: item for item in ifc_data}
     bcf_text = " ".join([
-        str(bcf_data[0].get('title', '')),
-        str(bcf_data[0].get('description', ''))
+        str(bcf_first.get('title', '')),
+        str(bcf_first.get('description', ''))
     ])
     
     # GUID 추출 테스트
@@ -248,10 +192,9 @@ def test_integration_link_generation():
     print(f"TF-IDF 매칭: {len(matches)}개")
     
     # 키워드 매칭 테스트
-    if ifc_data:
-        score = semantic_match_keyword(bcf_text, ifc_data[0])
-        print(f"키워드 점수: {score}")
-        assert 0.0 <= score <= 1.0
+    score = semantic_match_keyword(bcf_text, next(iter(ifc_map.values())))
+    print(f"키워드 점수: {score}")
+    assert 0.0 <= score <= 1.0
     
     print("✅ 통합 테스트 통과")
 
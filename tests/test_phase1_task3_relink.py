@@ -2,10 +2,12 @@
 Phase 1 - Task 1.3 단위 테스트
 전체 데이터 재링크: 링크 수 >= 500, 평균 신뢰도 검증
 """
-import json
+import math
 import sys
+from collections import Counter
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 # Add src to path
@@ -14,46 +16,102 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from contextualforget.core import read_jsonl
 
 
+LINKS_FILE = Path('data/processed/all_links.jsonl')
+
+
+@pytest.fixture(scope="module")
+def links_file():
+    """링크 파일 경로"""
+    return LINKS_FILE
+
+
+@pytest.fixture(scope="module")
+def existing_links_file(links_file):
+    """링크 파일 존재 여부를 모듈당 한 번만 확인 (없으면 의존 테스트 모두 skip)"""
+    if not links_file.exists():
+        pytest.skip(f"링크 파일이 없습니다: {links_file}")
+    return links_file
+
+
+@pytest.fixture(scope="module")
+def links_data(existing_links_file):
+    """링크 파일을 모듈당 한 번만 읽음"""
+    return list(read_jsonl(str(existing_links_file)))
+
+
+def _link_format_ok(link) -> bool:
+    """필수 필드 타입(topic_id: str, guid_matches: list, confidence: 숫자)과 신뢰도 범위 확인"""
+    confidence = link.get('confidence')
+    return (
+        isinstance(link.get('topic_id'), str)
+        and isinstance(link.get('guid_matches'), list)
+        and isinstance(confidence, (int, float))
+        and 0.0 <= confidence <= 1.0
+    )
+
+
+@pytest.fixture(scope="module")
+def links_stats(existing_links_file):
+    """테스트에서 공통으로 쓰는 집계값을 스트리밍 한 번으로 계산"""
+    total_links = 0
+    with_matches = 0
+    confidences = []
+    match_types = Counter()
+    bad_link_idx = bad_link = None  # 형식이 잘못된 첫 번째 링크
+    
+    for i, link in enumerate(read_jsonl(str(existing_links_file))):
+        if bad_link_idx is None and not _link_format_ok(link):
+            bad_link_idx, bad_link = i, link
+        
+        guid_matches = link.get('guid_matches', [])
+        total_links += len(guid_matches)
+        confidences.append(link.get('confidence', 0.0))
+        
+        if guid_matches:
+            with_matches += 1
+            match_types[link.get('match_type', 'unknown')] += 1
+    
+    # 신뢰도 구간 집계는 NumPy로 한 번에 처리
+    n_links = len(confidences)
+    conf = np.fromiter(confidences, dtype=np.float64, count=n_links)
+    
+    return {
+        'n_links': n_links,
+        'total_links': total_links,
+        'avg_confidence': math.fsum(confidences) / n_links if n_links else 0.0,
+        'with_matches': with_matches,
+        'high_conf': int((conf >= 0.7).sum()),
+        'medium_conf': int(((conf >= 0.4) & (conf < 0.7)).sum()),
+        'low_conf': int((conf < 0.4).sum()),
+        'match_types': match_types,
+        'bad_link_idx': bad_link_idx,
+        'bad_link': bad_link,
+    }
+
+
 class TestRelinkAllData:
     """전체 데이터 재링크 테스트"""
     
-    @pytest.fixture
-    def links_file(self):
-        """링크 파일 경로"""
-        return Path('data/processed/all_links.jsonl')
-    
     def test_links_file_exists(self, links_file):
         """테스트 1: 링크 파일이 존재하는지 확인"""
         assert links_file.exists(), f"링크 파일이 없습니다: {links_file}"
     
-    def test_links_file_not_empty(self, links_file):
+    def test_links_file_not_empty(self, links_data):
         """테스트 2: 링크 파일이 비어있지 않은지 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        assert len(links) > 0, "링크 파일이 비어있습니다"
+        assert len(links_data) > 0, "링크 파일이 비어있습니다"
     
-    def test_link_count_minimum(self, links_file):
+    def test_link_count_minimum(self, links_stats):
         """테스트 3: 최소 링크 수 확인 (≥ 500)"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        total_links = sum(len(link.get('guid_matches', [])) for link in links)
+        total_links = links_stats['total_links']
         
         assert total_links >= 500, \
             f"링크 수가 목표 미달입니다: {total_links} < 500"
         
         print(f"✅ 링크 수: {total_links}개")
     
-    def test_average_confidence(self, links_file):
+    def test_average_confidence(self, links_stats):
         """테스트 4: 평균 신뢰도 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        avg_confidence = sum(link.get('confidence', 0) for link in links) / len(links)
+        avg_confidence = links_stats['avg_confidence']
         
         # 신뢰도 목표는 0.6이지만, 현재 데이터 특성상 낮을 수 있음
         # 최소 0.1 이상인지 확인
@@ -67,133 +125,85 @@ class TestRelinkAllData:
         else:
             print(f"⚠️  신뢰도 목표 미달 (목표: 0.6, 실제: {avg_confidence:.3f})")
     
-    def test_link_format(self, links_file):
-        """테스트 5: 링크 형식 검증"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        
-        for i, link in enumerate(links[:10]):  # 처음 10개만 검증
-            # 필수 필드 확인
-            assert 'topic_id' in link, f"링크 {i}에 topic_id가 없습니다"
-            assert 'guid_matches' in link, f"링크 {i}에 guid_matches가 없습니다"
-            assert 'confidence' in link, f"링크 {i}에 confidence가 없습니다"
-            
-            # 타입 확인
-            assert isinstance(link['topic_id'], str), "topic_id는 문자열이어야 합니다"
-            assert isinstance(link['guid_matches'], list), "guid_matches는 리스트여야 합니다"
-            assert isinstance(link['confidence'], (int, float)), "confidence는 숫자여야 합니다"
-            
-            # 값 범위 확인
-            assert 0.0 <= link['confidence'] <= 1.0, \
-                f"confidence가 범위를 벗어났습니다: {link['confidence']}"
-    
-    def test_matching_success_rate(self, links_file):
+    def test_link_format(self, links_stats):
+        """테스트 5: 링크 형식 검증 (스트리밍 집계 중 전체 링크를 한 번에 검사)"""
+        bad_link_idx = links_stats['bad_link_idx']
+        assert bad_link_idx is None, \
+            f"링크 {bad_link_idx}의 형식이 올바르지 않습니다: {links_stats['bad_link']}"
+    
+    def test_matching_success_rate(self, links_stats):
         """테스트 6: 매칭 성공률 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        with_matches = [link for link in links if link.get('guid_matches')]
-        success_rate = len(with_matches) / len(links) * 100
+        n_links = links_stats['n_links']
+        with_matches = links_stats['with_matches']
+        success_rate = with_matches / n_links * 100
         
         # 최소 10% 이상 매칭 성공
         assert success_rate >= 10, \
             f"매칭 성공률이 너무 낮습니다: {success_rate:.1f}% < 10%"
         
-        print(f"매칭 성공률: {success_rate:.1f}% ({len(with_matches)}/{len(links)})")
+        print(f"매칭 성공률: {success_rate:.1f}% ({with_matches}/{n_links})")
     
-    def test_confidence_distribution(self, links_file):
+    def test_confidence_distribution(self, links_stats):
         """테스트 7: 신뢰도 분포 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        
-        high_conf = len([link for link in links if link.get('confidence', 0) >= 0.7])
-        medium_conf = len([link for link in links if 0.4 <= link.get('confidence', 0) < 0.7])
-        low_conf = len([link for link in links if link.get('confidence', 0) < 0.4])
+        n_links = links_stats['n_links']
+        high_conf = links_stats['high_conf']
+        medium_conf = links_stats['medium_conf']
+        low_conf = links_stats['low_conf']
         
         print(f"신뢰도 분포:")
-        print(f"  높음 (≥0.7): {high_conf}개 ({high_conf/len(links)*100:.1f}%)")
-        print(f"  중간 (0.4-0.7): {medium_conf}개 ({medium_conf/len(links)*100:.1f}%)")
-        print(f"  낮음 (<0.4): {low_conf}개 ({low_conf/len(links)*100:.1f}%)")
+        print(f"  높음 (≥0.7): {high_conf}개 ({high_conf/n_links*100:.1f}%)")
+        print(f"  중간 (0.4-0.7): {medium_conf}개 ({medium_conf/n_links*100:.1f}%)")
+        print(f"  낮음 (<0.4): {low_conf}개 ({low_conf/n_links*100:.1f}%)")
         
         # 모든 링크가 분류되어야 함
-        assert high_conf + medium_conf + low_conf == len(links)
+        assert high_conf + medium_conf + low_conf == n_links
     
-    def test_match_type_distribution(self, links_file):
+    def test_match_type_distribution(self, links_stats):
         """테스트 8: 매칭 타입 분포 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        with_matches = [link for link in links if link.get('guid_matches')]
-        
+        with_matches = links_stats['with_matches']
         if not with_matches:
             pytest.skip("매칭된 링크가 없습니다")
         
-        match_types = {}
-        for link in with_matches:
-            mt = link.get('match_type', 'unknown')
-            match_types[mt] = match_types.get(mt, 0) + 1
+        match_types = links_stats['match_types']
         
         print(f"매칭 타입 분포:")
-        for mt, count in sorted(match_types.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {mt}: {count}개 ({count/len(with_matches)*100:.1f}%)")
+        for mt, count in match_types.most_common():
+            print(f"  {mt}: {count}개 ({count/with_matches*100:.1f}%)")
         
         # 최소 1개 이상의 매칭 타입이 있어야 함
         assert len(match_types) > 0
     
-    def test_guid_matches_not_empty_for_matched(self, links_file):
+    def test_guid_matches_not_empty_for_matched(self, links_data):
         """테스트 9: 매칭 성공 시 guid_matches가 비어있지 않은지 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        
-        for i, link in enumerate(links):
+        for i, link in enumerate(links_data):
             if link.get('match_type') and link['match_type'] != '':
                 assert len(link.get('guid_matches', [])) > 0, \
                     f"링크 {i}는 match_type이 있지만 guid_matches가 비어있습니다"
     
-    def test_evidence_field_present(self, links_file):
+    def test_evidence_field_present(self, links_data):
         """테스트 10: evidence 필드가 있는지 확인"""
-        if not links_file.exists():
-            pytest.skip("링크 파일이 없습니다")
-        
-        links = list(read_jsonl(str(links_file)))
-        
-        for i, link in enumerate(links[:10]):
+        for i, link in enumerate(links_data[:10]):
             if 'evidence' in link:
                 assert isinstance(link['evidence'], str), \
                     f"링크 {i}의 evidence가 문자열이 아닙니다"
 
 
-def test_relink_script_performance():
+def test_relink_script_performance(links_stats):
     """통합 테스트: relink 스크립트 성능"""
-    links_file = Path('data/processed/all_links.jsonl')
-    
-    if not links_file.exists():
-        pytest.skip("링크 파일이 없습니다")
-    
-    links = list(read_jsonl(str(links_file)))
-    
-    # 기본 통계
-    total_links = sum(len(link.get('guid_matches', [])) for link in links)
-    avg_confidence = sum(link.get('confidence', 0) for link in links) / len(links)
-    with_matches = [link for link in links if link.get('guid_matches')]
-    success_rate = len(with_matches) / len(links) * 100
+    n_links = links_stats['n_links']
+    total_links = links_stats['total_links']
+    avg_confidence = links_stats['avg_confidence']
+    with_matches = links_stats['with_matches']
+    success_rate = with_matches / n_links * 100 if n_links else 0.0
     
     print(f"\\n📊 전체 링크 생성 성능:")
-    print(f"   총 BCF 이슈: {len(links)}개")
-    print(f"   매칭 성공: {len(with_matches)}개 ({success_rate:.1f}%)")
+    print(f"   총 BCF 이슈: {n_links}개")
+    print(f"   매칭 성공: {with_matches}개 ({success_rate:.1f}%)")
     print(f"   총 링크 수: {total_links}개")
     print(f"   평균 신뢰도: {avg_confidence:.3f}")
     
     # 성능 검증
-    assert len(links) > 0, "링크가 없습니다"
+    assert n_links > 0, "링크가 없습니다"
     assert total_links >= 500, f"링크 수 목표 미달: {total_links} < 500"
     
     if avg_confidence >= 0.6:
@@ -0,0 +1,222 @@
+"""Tests for realtime file watching and graph updates."""
+import time
+from datetime import datetime
+from pathlib import Path
+
+from contextualforget.realtime import realtime_monitor
+from contextualforget.realtime.file_watcher import FileChangeEvent, FileChangeType, FileWatcher
+from contextualforget.realtime.graph_updater import GraphUpdater
+from contextualforget.realtime.realtime_monitor import RealtimeMonitor
+
+
+class TestFileWatcher:
+    def test_detect_changes(self, tmp_path):
+        """Created, modified and deleted files are reported once each."""
+        watcher = FileWatcher([tmp_path])
+        kept = str(tmp_path / "kept.ifc")
+        changed = str(tmp_path / "changed.ifc")
+        removed = str(tmp_path / "removed.bcfzip")
+        added = str(tmp_path / "added.bcfzip")
+
+        watcher.file_states = {kept: 1.0, changed: 1.0, removed: 1.0}
+        events = watcher._detect_changes({kept: 1.0, changed: 2.0, added: 1.0})
+
+        by_path = {str(event.path): event for event in events}
+        assert len(events) == 3
+        assert by_path[changed].change_type == FileChangeType.MODIFIED
+        assert by_path[changed].file_type == 'ifc'
+        assert by_path[added].change_type == FileChangeType.CREATED
+        assert by_path[added].file_type == 'bcf'
+        assert by_path[removed].change_type == FileChangeType.DELETED
+
+        watcher.file_states = {kept: 1.0, changed: 2.0}
+        assert watcher._detect_changes({kept: 1.0, changed: 2.0}) == []
+
+    def test_native_change_deduplicates(self, tmp_path):
+        """Repeated native events for an unchanged file are dispatched once."""
+        watcher = FileWatcher([tmp_path])
+        received = []
+        watcher.register_callback(received.append)
+
+        model = tmp_path / "model.ifc"
+        model.write_text("ISO-10303-21;")
+        watcher._on_native_change(model, FileChangeType.CREATED)
+        watcher._on_native_change(model, FileChangeType.MODIFIED)
+        watcher._on_native_change(tmp_path / "notes.txt", FileChangeType.CREATED)
+        watcher._on_native_change(model, FileChangeType.DELETED)
+
+        assert [e.change_type for e in received] == [FileChangeType.CREATED, FileChangeType.DELETED]
+        assert str(model) not in watcher.file_states
+        assert all(isinstance(e.path, Path) for e in received)
+
+    def test_scan_files(self, tmp_path):
+        """Only IFC/BCF files are collected, including nested directories."""
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+        (tmp_path / "top.ifc").write_text("x")
+        (nested / "deep.bcfzip").write_text("x")
+        (nested / "ignored.txt").write_text("x")
+
+        files = FileWatcher([tmp_path])._scan_files()
+
+        assert set(files) == {str(tmp_path / "top.ifc"), str(nested / "deep.bcfzip")}
+        assert all(isinstance(mtime, float) for mtime in files.values())
+
+
+class TestGraphUpdater:
+    def test_save_graph_atomic(self, tmp_path):
+        """Graph is written through a temp file and can be reloaded."""
+        graph_path = tmp_path / "graph.gpickle"
+        updater = GraphUpdater(graph_path, tmp_path / "processed")
+        updater.add_ifc_nodes([{"GlobalId": "1kTvXnbbzCWw8lcMd1dR4o", "Name": "P-1"}])
+        updater.save_graph()
+
+        assert graph_path.exists()
+        assert not (tmp_path / "graph.gpickle.tmp").exists()
+
+        reloaded = GraphUpdater(graph_path, tmp_path / "processed").load_graph()
+        assert "ifc:1kTvXnbbzCWw8lcMd1dR4o" in reloaded
+
+
+class TestRealtimeMonitor:
+    def test_burst_of_changes_saves_once(self, tmp_path, monkeypatch):
+        """Saves are debounced so a burst of events results in one write."""
+        timers = []
+
+        class ManualTimer:
+            """Records scheduled saves instead of running them on a clock."""
+
+            def __init__(self, interval, function):
+                self.function = function
+                self.cancelled = False
+                self.daemon = False
+                timers.append(self)
+
+            def start(self):
+                pass
+
+            def cancel(self):
+                self.cancelled = True
+
+        monkeypatch.setattr(realtime_monitor.threading, "Timer", ManualTimer)
+        monitor = RealtimeMonitor([tmp_path], tmp_path / "graph.gpickle",
+                                  tmp_path / "processed", save_delay=0.05)
+        saves = []
+        monkeypatch.setattr(monitor.graph_updater, "save_graph", lambda: saves.append(1))
+
+        for i in range(5):
+            monitor._on_file_changed(FileChangeEvent(
+                path=tmp_path / f"missing{i}.ifc",
+                change_type=FileChangeType.DELETED,
+                timestamp=datetime.now(),
+                file_type='ifc'
+            ))
+        monitor._parse_pool.shutdown(wait=True)
+
+        # Every event rescheduled the save; only the last timer is still pending
+        pending = [timer for timer in timers if not timer.cancelled]
+        assert len(timers) == 5
+        assert len(pending) == 1
+        pending[0].function()
+
+        assert monitor.stats['files_processed'] == 5
+        assert saves == [1]
+
+    def test_add_nodes_in_bulk(self, tmp_path):
+        """Bulk insertion keeps add/update counts and links BCF topics to IFC nodes."""
+        updater = GraphUpdater(tmp_path / "graph.gpickle", tmp_path / "processed")
+
+        added, updated = updater.add_ifc_nodes([
+            {"GlobalId": "g1", "Name": "Wall"},
+            {"GlobalId": "g2", "Name": "Door"},
+            {"GlobalId": "g1", "Name": "Wall (renamed)"},
+            {"Name": "no guid"},
+        ])
+        assert (added, updated) == (2, 1)
+        assert updater.graph.nodes["ifc:g1"]["name"] == "Wall (renamed)"
+
+        added, updated = updater.add_bcf_nodes([
+            {"Guid": "t1", "Title": "Clash", "RelatedTopics": ["g1", "g2", "missing"]},
+            {"Guid": "t1", "Title": "Clash (updated)", "RelatedTopics": ["g1"]},
+        ])
+        assert (added, updated) == (1, 1)
+        assert updater.graph.nodes["bcf:t1"]["title"] == "Clash (updated)"
+        assert set(updater.graph.successors("bcf:t1")) == {"ifc:g1", "ifc:g2"}
+        assert updater.graph.edges["bcf:t1", "ifc:g1"]["relation"] == "references"
+
+    def test_parallel_changes_are_all_applied(self, tmp_path, monkeypatch):
+        """Files parsed in the pool are merged into the graph under the updater lock."""
+        monitor = RealtimeMonitor([tmp_path], tmp_path / "graph.gpickle",
+                                  tmp_path / "processed", save_delay=0.05, max_workers=4)
+        updater = monitor.graph_updater
+        monkeypatch.setattr(updater, "process_ifc_file", lambda path: [
+            {"GlobalId": f"{path.stem}-{j}", "Name": "Wall"} for j in range(50)
+        ])
+
+        for i in range(8):
+            monitor._on_file_changed(FileChangeEvent(
+                path=tmp_path / f"model{i}.ifc",
+                change_type=FileChangeType.CREATED,
+                timestamp=datetime.now(),
+                file_type='ifc'
+            ))
+        monitor._parse_pool.shutdown(wait=True)
+
+        assert monitor.stats['files_processed'] == 8
+        assert monitor.stats['ifc_files'] == 8
+        assert updater.graph.number_of_nodes() == 8 * 50
+
+    def test_changes_to_same_path_apply_in_order(self, tmp_path, monkeypatch):
+        """Events for one path are processed one at a time and only the latest pending one is kept."""
+        monitor = RealtimeMonitor([tmp_path], tmp_path / "graph.gpickle",
+                                  tmp_path / "processed", save_delay=0.05, max_workers=4)
+        applied = []
+
+        def slow_handle(event, save=True):
+            time.sleep(0.1 if event.timestamp.microsecond == 0 else 0.0)
+            applied.append(event.timestamp.microsecond)
+
+        monkeypatch.setattr(monitor.graph_updater, "handle_file_change", slow_handle)
+
+        path = tmp_path / "model.ifc"
+        for version in range(4):
+            monitor._on_file_changed(FileChangeEvent(
+                path=path,
+                change_type=FileChangeType.MODIFIED,
+                timestamp=datetime(2025, 1, 1, microsecond=version),
+                file_type='ifc'
+            ))
+        monitor._parse_pool.shutdown(wait=True)
+
+        # 첫 이벤트 처리 중 들어온 이벤트는 최신 것(3)만 그 뒤에 적용
+        assert applied == [0, 3]
+        assert monitor._pending_events == {}
+        assert monitor._active_paths == set()
+
+    def test_load_graph_round_trip(self, tmp_path):
+        """A saved graph is reloaded from the memory-mapped file."""
+        graph_path = tmp_path / "graph.gpickle"
+        updater = GraphUpdater(graph_path, tmp_path / "processed")
+        updater.add_ifc_nodes([{"GlobalId": "g1", "Name": "Wall"}])
+        updater.save_graph()
+
+        reloaded = GraphUpdater(graph_path, tmp_path / "processed").load_graph()
+        assert reloaded.nodes["ifc:g1"]["name"] == "Wall"
+
+    def test_save_graph_skips_when_clean(self, tmp_path):
+        """Saving twice without changes writes the graph only once."""
+        graph_path = tmp_path / "graph.gpickle"
+        updater = GraphUpdater(graph_path, tmp_path / "processed")
+        updater.add_ifc_nodes([{"GlobalId": "g1", "Name": "Wall"}])
+        updater.save_graph()
+        graph_path.unlink()
+
+        updater.save_graph()
+        assert not graph_path.exists()
+
+        updater.add_ifc_nodes([])
+        updater.save_graph()
+        assert not graph_path.exists()
+
+        updater.save_graph(force=True)
+        assert graph_path.exists()
@@ -1,38 +1,103 @@
 """Tests for utility functions."""
-import pytest
-import tempfile
-import os
+import math
+import pickle
+import shutil
+import zipfile
+
+import networkx as nx
+import numpy as np
+
 from contextualforget.core import (
-    read_jsonl, write_jsonl, extract_ifc_entities, parse_bcf_zip
+    extract_ifc_entities,
+    parse_bcf_zip,
+    read_graph,
+    read_jsonl,
+    write_graph_json,
+    write_jsonl,
 )
 
 
 class TestUtils:
-    def test_read_write_jsonl(self):
+    def test_read_write_jsonl(self, tmp_path):
         """Test JSONL read/write functionality."""
         test_data = [
             {"id": 1, "name": "test1"},
             {"id": 2, "name": "test2"},
             {"id": 3, "name": "test3"}
         ]
+        path = tmp_path / "test.jsonl"
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.jsonl') as f:
-            temp_path = f.name
+        # Write data
+        write_jsonl(str(path), test_data)
         
-        try:
-            # Write data
-            write_jsonl(temp_path, test_data)
-            
-            # Read data
-            read_data = list(read_jsonl(temp_path))
-            
-            assert len(read_data) == 3
-            assert read_data[0]["id"] == 1
-            assert read_data[1]["name"] == "test2"
-            
-        finally:
-            os.unlink(temp_path)
+        # Read data
+        read_data = list(read_jsonl(str(path)))
+        
+        assert len(read_data) == 3
+        assert read_data[0]["id"] == 1
+        assert read_data[1]["name"] == "test2"
     
+    def test_read_write_jsonl_unicode(self, tmp_path):
+        """Test JSONL round trip keeps non-ASCII text unescaped and skips blank lines."""
+        path = tmp_path / "nested" / "rows.jsonl"
+        rows = [{"title": "배관 간섭", "count": 2}, {"tags": ["a", "b"], "score": 0.5}]
+
+        write_jsonl(str(path), rows)
+        assert "배관 간섭" in path.read_text(encoding="utf-8")
+
+        with path.open("a", encoding="utf-8") as f:
+            f.write("\n   \n")
+        assert list(read_jsonl(str(path))) == rows
+
+    def test_write_jsonl_numpy_values(self, tmp_path):
+        """Test JSONL writes accept numpy scalars and NaN rows read back through read_jsonl."""
+        path = tmp_path / "numpy.jsonl"
+        rows = [
+            {"score": np.float64(0.5), "count": np.int64(3), "ratio": np.float32(0.25)},
+            {"id": 1, "score": float("nan"), "limit": np.float64("inf")},
+            {"id": 2, "note": None, "text": "null"},
+        ]
+
+        write_jsonl(str(path), rows)
+
+        first, second, third = read_jsonl(str(path))
+        assert first == {"score": 0.5, "count": 3, "ratio": 0.25}
+        assert second["id"] == 1
+        assert math.isnan(second["score"])
+        assert second["limit"] == float("inf")
+        assert third == {"id": 2, "note": None, "text": "null"}
+        # rows are written in one compact format, with or without non-finite values
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert all(", " not in line and ": " not in line for line in lines)
+
+    def test_write_jsonl_multiple_chunks(self, tmp_path):
+        """Test JSONL writes spanning several write chunks keep every row in order."""
+        path = tmp_path / "many.jsonl"
+        rows = ({"id": i} for i in range(10000))
+
+        write_jsonl(str(path), rows)
+
+        assert [r["id"] for r in read_jsonl(str(path))] == list(range(10000))
+
+    def test_write_jsonl_shards_same_directory(self, tmp_path):
+        """Test several shards written into one new directory are all created."""
+        shard_dir = tmp_path / "shards"
+        for i in range(3):
+            write_jsonl(str(shard_dir / f"part{i}.jsonl"), [{"shard": i}])
+
+        assert sorted(p.name for p in shard_dir.iterdir()) == ["part0.jsonl", "part1.jsonl", "part2.jsonl"]
+        assert list(read_jsonl(str(shard_dir / "part2.jsonl"))) == [{"shard": 2}]
+
+    def test_write_jsonl_recreates_removed_directory(self, tmp_path):
+        """Test writing again into a directory removed after the first write."""
+        out_dir = tmp_path / "out"
+        write_jsonl(str(out_dir / "a.jsonl"), [{"run": 1}])
+        shutil.rmtree(out_dir)
+
+        write_jsonl(str(out_dir / "a.jsonl"), [{"run": 2}])
+
+        assert list(read_jsonl(str(out_dir / "a.jsonl"))) == [{"run": 2}]
+
     def test_extract_ifc_entities(self):
         """Test IFC entity extraction."""
         ifc_text = """
@@ -60,3 +125,77 @@ class TestUtils:
         # Should deduplicate by GUID
         assert len(entities) == 1
         assert entities[0]["guid"] == "0xScRe4drECQ4DMSqUjd6d"
+
+    def test_extract_ifc_entities_large_repeated(self):
+        """Test extraction over a large repeated blob still deduplicates by GUID."""
+        ifc_text = (
+            "#100= IFCPROJECT('0xScRe4drECQ4DMSqUjd6d',$,'Sample',$,$,$,$,$,$);\n"
+            "#500= IFCBUILDING('2FCZDorxHDT8NI01kdXi8P',$,'Test Building',$,$,$,$,$,.ELEMENT.,$,$,$);\n"
+            "#1000= IFCBUILDINGELEMENTPROXY('1kTvXnbbzCWw8lcMd1dR4o',$,'P-1','sample',$,$,$,$,$);\n"
+        ) * 10000
+
+        entities = extract_ifc_entities(ifc_text)
+
+        assert [e["type"] for e in entities] == ["PROJECT", "BUILDING", "BUILDINGELEMENTPROXY"]
+
+    def test_extract_ifc_entities_bytes(self):
+        """Test IFC entity extraction from undecoded bytes."""
+        ifc_bytes = (
+            b"#100= IFCPROJECT('0xScRe4drECQ4DMSqUjd6d',$,'Sample',$,$,$,$,$,$);\n"
+            b"#500= IFCBUILDING('2FCZDorxHDT8NI01kdXi8P',$,'\xed\x85\x8c\xec\x8a\xa4\xed\x8a\xb8',$);\n"
+        )
+
+        entities = extract_ifc_entities(ifc_bytes)
+
+        assert entities == extract_ifc_entities(ifc_bytes.decode("utf-8"))
+        assert [e["type"] for e in entities] == ["PROJECT", "BUILDING"]
+        assert all(isinstance(e["guid"], str) for e in entities)
+
+    def test_parse_bcf_zip(self, tmp_path):
+        """Test BCF markup parsing straight from the archive stream."""
+        markup = """<?xml version="1.0" encoding="UTF-8"?>
+        <Markup>
+          <Topic Guid="topic-1">
+            <Title>HVAC clearance</Title>
+            <CreationDate>2024-01-01T00:00:00Z</CreationDate>
+            <CreationAuthor>engineer_a</CreationAuthor>
+            <Description>Duct clash</Description>
+          </Topic>
+          <Viewpoints><RelatedTopic Guid="ref-1"/></Viewpoints>
+        </Markup>"""
+        bcf_path = tmp_path / "issues.bcfzip"
+        with zipfile.ZipFile(bcf_path, "w") as z:
+            z.writestr("topic-1/markup.bcf", markup)
+            z.writestr("broken/markup.bcf", "<Markup><Topic>")
+            z.writestr("bcf.version", "<Version/>")
+
+        rows = parse_bcf_zip(str(bcf_path))
+
+        assert rows == [{
+            "topic_id": "topic-1",
+            "title": "HVAC clearance",
+            "created": "2024-01-01T00:00:00Z",
+            "author": "engineer_a",
+            "description": "Duct clash",
+            "ref": "ref-1"
+        }]
+
+    def test_graph_json_round_trip(self, tmp_path):
+        """Test node-link JSON graph persistence keeps tuple node ids."""
+        G = nx.DiGraph()
+        G.add_node(("IFC", "g1"), name="Wall")
+        G.add_node(("BCF", "t1"), title="배관 간섭")
+        G.add_edge(("BCF", "t1"), ("IFC", "g1"), type="refersTo", confidence=0.9)
+
+        json_path = tmp_path / "graph.json"
+        write_graph_json(G, str(json_path))
+        loaded = read_graph(str(json_path))
+
+        assert loaded.is_directed()
+        assert loaded.nodes[("BCF", "t1")]["title"] == "배관 간섭"
+        assert loaded.edges[("BCF", "t1"), ("IFC", "g1")]["confidence"] == 0.9
+
+        pickle_path = tmp_path / "graph.gpickle"
+        with pickle_path.open("wb") as f:
+            pickle.dump(G, f)
+        assert set(read_graph(str(pickle_path)).nodes) == set(G.nodes)